@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Checkout cost of a ConnectionPool against a fresh connection per call
+
+MySQL is stood in by SQLite connections to a file database, with an
+optional sleep per connect to model the TCP + auth handshake.
+
+Run from the project directory:
+    python3 -m benchmarks.db_pool [queries] [handshake_ms]
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from filtered_logger import ConnectionPool
+
+
+def query(conn) -> None:
+    """One small query"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM users")
+    cursor.fetchall()
+    cursor.close()
+
+
+def rate(count: int, checkout) -> float:
+    """Returns the queries per second, each on a checked out connection"""
+    start = time.perf_counter()
+    for _ in range(count):
+        checkout()
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    handshake = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.001
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "users.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE users (name TEXT)")
+
+    def connect():
+        time.sleep(handshake)
+        return sqlite3.connect(path, check_same_thread=False)
+
+    def fresh():
+        conn = connect()
+        query(conn)
+        conn.close()
+
+    pool = ConnectionPool(connect, size=5)
+
+    def pooled():
+        with pool.connection() as conn:
+            query(conn)
+
+    base = rate(count, fresh)
+    speed = rate(count, pooled)
+    pool.close()
+    shutil.rmtree(directory)
+
+    print("{} queries, {:.1f} ms handshake".format(count, handshake * 1000))
+    print("  fresh connection: {:9.0f} queries/s".format(base))
+    print("  pooled:           {:9.0f} queries/s  x{:.1f}"
+          .format(speed, speed / base))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Throughput of hash_passwords() for 1 worker up to one worker per core
+
+Run from the project directory:
+    python3 -m benchmarks.hash_passwords [passwords] [rounds]
+"""
+import os
+import sys
+import time
+
+from encrypt_password import hash_passwords, validate_many
+
+
+def throughput(count: int, workers: int, rounds: int) -> float:
+    """Returns the passwords hashed per second with workers processes"""
+    passwords = ("password{}".format(i) for i in range(count))
+    start = time.perf_counter()
+    for _ in hash_passwords(passwords, workers=workers, rounds=rounds):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    cores = os.cpu_count() or 1
+
+    print("{} passwords, rounds {}, {} cores".format(count, rounds, cores))
+    workers, base = 1, None
+    while True:
+        rate = throughput(count, workers, rounds)
+        base = base or rate
+        print("  {:3d} workers: {:8.0f} hashes/s  x{:.2f}"
+              .format(workers, rate, rate / base))
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+    hashes = list(hash_passwords(["password"] * 64, rounds=rounds))
+    pairs = zip(hashes, ["password", "wrong"] * 32)
+    assert list(validate_many(pairs)) == [True, False] * 32
@@ -4,20 +4,61 @@ Encrypt Password module
 """
 
 import bcrypt
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple
 
-def hash_password(password: str) -> bytes:
+ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+
+def hash_password(password: str, rounds: int = None) -> bytes:
     """
     Hash a password using bcrypt.
 
     Args:
         password (str): The password to be hashed.
+        rounds (int): The bcrypt cost factor (default BCRYPT_ROUNDS).
 
     Returns:
         bytes: The salted, hashed password.
     """
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    if rounds is None:
+        rounds = ROUNDS
+    hashed_password = bcrypt.hashpw(password.encode('utf-8'),
+                                    bcrypt.gensalt(rounds))
     return hashed_password
 
+def hash_rounds(hashed_password: bytes) -> int:
+    """
+    Read the cost factor of a bcrypt hash ($2b$<cost>$...).
+
+    Args:
+        hashed_password (bytes): The salted, hashed password.
+
+    Returns:
+        int: The cost factor, None if the hash is malformed.
+    """
+    try:
+        return int(hashed_password.split(b'$')[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed_password: bytes, rounds: int = None) -> bool:
+    """
+    Tell whether a hash was made with another cost factor.
+
+    Args:
+        hashed_password (bytes): The salted, hashed password.
+        rounds (int): The expected cost factor (default BCRYPT_ROUNDS).
+
+    Returns:
+        bool: True if the password should be hashed again.
+    """
+    if rounds is None:
+        rounds = ROUNDS
+    return hash_rounds(hashed_password) != rounds
+
 def is_valid(hashed_password: bytes, password: str) -> bool:
     """
     Validate a password against its hashed version.
@@ -31,6 +72,91 @@ def is_valid(hashed_password: bytes, password: str) -> bool:
     """
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
 
+def _hash_chunk(passwords: list, rounds: int) -> list:
+    """Hash a chunk of passwords in a worker process."""
+    return [hash_password(password, rounds) for password in passwords]
+
+def _validate_chunk(pairs: list) -> list:
+    """Validate a chunk of (hashed_password, password) in a worker process."""
+    return [is_valid(hashed_password, password)
+            for hashed_password, password in pairs]
+
+def _map_ordered(function: Callable, items: Iterable, workers: int,
+                 chunk_size: int, progress: Callable, *args) -> Iterator:
+    """
+    Apply function to chunks of items in a process pool.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    whatever the length of items, and results are yielded in input order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    items = iter(items)
+    pending = deque()
+    done = 0
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(function, chunk, *args))
+            if not pending:
+                break
+            results = pending.popleft().result()
+            done += len(results)
+            if progress is not None:
+                progress(done)
+            yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def hash_passwords(passwords: Iterable[str], workers: int = None,
+                   rounds: int = None, chunk_size: int = 16,
+                   progress: Callable[[int], None] = None
+                   ) -> Iterator[bytes]:
+    """
+    Hash many passwords across a process pool.
+
+    Args:
+        passwords (Iterable[str]): The passwords to be hashed, consumed lazily.
+        workers (int): The number of processes (default: one per core).
+        rounds (int): The bcrypt cost factor (default BCRYPT_ROUNDS).
+        chunk_size (int): The number of passwords sent to a worker at once.
+        progress (Callable): Called with the number of passwords hashed
+            so far after each chunk.
+
+    Returns:
+        Iterator[bytes]: The salted, hashed passwords, in input order.
+    """
+    if rounds is None:
+        rounds = ROUNDS
+    return _map_ordered(_hash_chunk, passwords, workers, chunk_size,
+                        progress, rounds)
+
+def validate_many(pairs: Iterable[Tuple[bytes, str]], workers: int = None,
+                  chunk_size: int = 16,
+                  progress: Callable[[int], None] = None) -> Iterator[bool]:
+    """
+    Validate many passwords across a process pool.
+
+    Args:
+        pairs (Iterable[Tuple[bytes, str]]): (hashed_password, password)
+            pairs, consumed lazily.
+        workers (int): The number of processes (default: one per core).
+        chunk_size (int): The number of pairs sent to a worker at once.
+        progress (Callable): Called with the number of pairs validated
+            so far after each chunk.
+
+    Returns:
+        Iterator[bool]: is_valid() of each pair, in input order.
+    """
+    return _map_ordered(_validate_chunk, pairs, workers, chunk_size,
+                        progress)
+
 if __name__ == "__main__":
     password = "MyAmazingPassw0rd"
     encrypted_password = hash_password(password)
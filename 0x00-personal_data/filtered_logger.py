@@ -4,49 +4,237 @@
     returns the log message
 """
 
+import atexit
 import logging
+import logging.handlers
 import csv
-from typing import List
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, List, Pattern, TextIO
 import os
 import mysql.connector
 
 PII_FIELDS = ("name", "email", "phone", "ssn", "password")  # Replace with the appropriate PII fields
+USER_COLUMNS = ("name", "email", "phone", "ssn", "password", "ip",
+                "last_login", "user_agent")
+
+@lru_cache(maxsize=64)
+def redaction_pattern(fields: tuple, separator: str) -> Pattern:
+    """ Return the compiled pattern matching field=value<separator> """
+    names = "|".join(re.escape(field) for field in fields)
+    return re.compile(rf"({names})=.*?{re.escape(separator)}")
 
 class RedactingFormatter(logging.Formatter):
-    """ Redacting Formatter class """
+    """ Redacting Formatter class
+
+    The redaction pattern is compiled once per field set. With split=True
+    the message is instead split on the separator and each key=value
+    item whose key is in fields is redacted, without regex matching
+    (items must be key=value, keys are matched exactly).
+    """
     
     REDACTION = "***"
     FORMAT = "[HOLBERTON] %(name)s %(levelname)s %(asctime)-15s: %(message)s"
     SEPARATOR = ";"
 
-    def __init__(self, fields: List[str]):
+    def __init__(self, fields: List[str], split: bool = False):
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self.field_set = frozenset(fields)
+        self.pattern = redaction_pattern(tuple(fields), self.SEPARATOR)
+        self.replacement = r"\1={}{}".format(
+            self.REDACTION.replace("\\", r"\\"), self.SEPARATOR)
+        self.split = split
 
     def format(self, record: logging.LogRecord) -> str:
         """ Format Function """
-        record.msg = self.filter_datum(self.fields, self.REDACTION,
-                                       record.msg, self.SEPARATOR)
+        record.msg = self.redact(record.getMessage())
+        record.args = None
         return super().format(record)
 
+    def redact(self, message: str) -> str:
+        """ Obfuscate the fields of the formatter in the log message """
+        if self.split:
+            return self.filter_split(self.field_set, self.REDACTION,
+                                     message, self.SEPARATOR)
+        return self.pattern.sub(self.replacement, message)
+
     @staticmethod
     def filter_datum(fields: List[str], redaction: str,
                      message: str, separator: str) -> str:
         """ Obfuscate specified fields in the log message using redaction """
-        return re.sub(rf"({'|'.join(fields)})=.*?{separator}",
-                      rf"\1={redaction}{separator}", message)
+        return redaction_pattern(tuple(fields), separator).sub(
+            lambda match: f"{match.group(1)}={redaction}{separator}",
+            message)
+
+    @staticmethod
+    def filter_split(fields: frozenset, redaction: str,
+                     message: str, separator: str) -> str:
+        """ Obfuscate specified fields in the log message by key lookup """
+        items = message.split(separator)
+        for i in range(len(items) - 1):
+            key, equals, _ = items[i].partition("=")
+            if equals and key.lstrip() in fields:
+                items[i] = f"{key}={redaction}"
+        return separator.join(items)
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """ QueueHandler for a bounded queue
+
+    Records are enqueued as they are: merging, redaction and formatting
+    happen on the listener thread. When the queue is full, the overflow
+    policy either blocks the caller ("block"), discards the record
+    ("drop") or discards it and reports the count in the log ("count").
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop", "count")
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "block"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of "
+                             f"{self.OVERFLOW_POLICIES}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """ Defer all formatting to the listener """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """ Enqueue a record, applying the overflow policy """
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
 
-def get_logger() -> logging.Logger:
-    """ Return a configured logging.Logger object """
+class BatchQueueListener(logging.handlers.QueueListener):
+    """ QueueListener writing records to a stream handler in batches
+
+    Each wakeup drains up to batch_size records, redacts and formats
+    them with the handler's formatter and writes them with a single
+    write and flush.
+    """
+
+    def __init__(self, log_queue: queue.Queue,
+                 handler: logging.StreamHandler, batch_size: int = 256,
+                 queue_handler: BoundedQueueHandler = None):
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.queue_handler = queue_handler
+        self._reported = 0
+        self._stopping = False
+
+    def dequeue(self, block: bool):
+        """ Return a batch of records, or the sentinel alone """
+        if self._stopping:
+            return self._sentinel
+        batch = [self.queue.get(block)]
+        if batch[0] is self._sentinel:
+            return self._sentinel
+        while len(batch) < self.batch_size:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is self._sentinel:
+                self._stopping = True
+                break
+            batch.append(record)
+        return batch
+
+    def handle(self, records: List[logging.LogRecord]) -> None:
+        """ Format and write a batch of records """
+        handler = self.handlers[0]
+        lines = []
+        for record in records:
+            if record.levelno < handler.level:
+                continue
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        lines.extend(self._dropped_lines(handler))
+        if not lines:
+            return
+        with handler.lock:
+            handler.stream.write("".join(lines))
+            handler.flush()
+
+    def enqueue_sentinel(self) -> None:
+        """ Wait for room in the bounded queue to enqueue the sentinel """
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        """ Drain the queue and stop the listener thread """
+        if self._thread is not None:
+            super().stop()
+        self._stopping = False
+
+    def _dropped_lines(self, handler: logging.StreamHandler) -> List[str]:
+        """ Return the report of the records dropped since the last one """
+        if self.queue_handler is None or \
+                self.queue_handler.overflow != "count":
+            return []
+        dropped = self.queue_handler.dropped
+        if dropped == self._reported:
+            return []
+        record = logging.LogRecord(
+            "user_data", logging.WARNING, __file__, 0,
+            "%d log records dropped (queue full)",
+            (dropped - self._reported,), None)
+        self._reported = dropped
+        return [handler.format(record) + handler.terminator]
+
+def get_logger(queue_size: int = None, overflow: str = None,
+               batch_size: int = None) -> logging.Logger:
+    """ Return a configured logging.Logger object
+
+    With a queue_size (default PERSONAL_DATA_LOG_QUEUE_SIZE, 0 for
+    synchronous logging) records go through a bounded queue to a
+    listener thread, which redacts and writes them in batches of
+    batch_size (PERSONAL_DATA_LOG_BATCH_SIZE, default 256). overflow
+    (PERSONAL_DATA_LOG_OVERFLOW, default "block") is the policy of
+    BoundedQueueHandler when the queue is full.
+    """
     logger = logging.getLogger("user_data")
+    if logger.handlers:
+        return logger
     logger.setLevel(logging.INFO)
 
+    if queue_size is None:
+        queue_size = int(os.getenv("PERSONAL_DATA_LOG_QUEUE_SIZE", 0))
+    if overflow is None:
+        overflow = os.getenv("PERSONAL_DATA_LOG_OVERFLOW", "block")
+    if batch_size is None:
+        batch_size = int(os.getenv("PERSONAL_DATA_LOG_BATCH_SIZE", 256))
+
     formatter = RedactingFormatter(fields=PII_FIELDS)
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
 
-    logger.addHandler(stream_handler)
+    if queue_size > 0:
+        log_queue = queue.Queue(maxsize=queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, overflow)
+        listener = BatchQueueListener(log_queue, stream_handler,
+                                      batch_size, queue_handler)
+        queue_handler.listener = listener
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(stream_handler)
     logger.propagate = False
 
     return logger
@@ -67,21 +255,207 @@ def get_db() -> mysql.connector.connection.MySQLConnection:
 
     return connector
 
+class ConnectionPool:
+    """ Bounded pool of reusable database connections
+
+    At most size connections are checked out at once; acquire() waits
+    up to timeout seconds for one to be released. Idle connections are
+    reused most recently used first and health checked on checkout:
+    dead ones are closed and replaced by a new connection. Released
+    connections are rolled back first, so no borrower inherits the
+    open transaction (and snapshot) of the previous one.
+    """
+
+    def __init__(self, connect: Callable, size: int = 5,
+                 timeout: float = 30):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        """ Check out a healthy connection """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no connection released in {self.timeout}s")
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if self.is_healthy(conn):
+                    return conn
+                self._close(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard: bool = False) -> None:
+        """ Return a connection to the pool, or close it if discard
+        or if it can't be rolled back
+        """
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            self._close(conn)
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """ Check out a connection for the duration of a with block
+
+        The connection is discarded if the block raises, since its
+        state is then unknown.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def close(self) -> None:
+        """ Close the idle connections """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+    @staticmethod
+    def is_healthy(conn) -> bool:
+        """ Ping a connection (is_connected() if the driver has it) """
+        try:
+            if hasattr(conn, "is_connected"):
+                return conn.is_connected()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(conn) -> None:
+        """ Close a connection, ignoring errors of dead ones """
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """ Return the process-wide pool of get_db() connections
+
+    Its size is PERSONAL_DATA_DB_POOL_SIZE (default 5).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                get_db, int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", 5)),
+                float(os.getenv("PERSONAL_DATA_DB_POOL_TIMEOUT", 30)))
+            atexit.register(_pool.close)
+        return _pool
+
+def _user_batches(db, batch_size: int) -> Iterator[List[tuple]]:
+    """ Yield the USER_COLUMNS of the users table in batches of
+    batch_size rows, streamed from the server by an unbuffered cursor
+    """
+    cursor = db.cursor(buffered=False)
+    try:
+        cursor.execute(f"SELECT {', '.join(USER_COLUMNS)} FROM users;")
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield batch
+    finally:
+        cursor.close()
+
+def log_users(db, logger: logging.Logger, batch_size: int = 1000) -> int:
+    """ Log each row of the users table with logger
+
+    Rows are streamed like in export_users, but every row goes through
+    the logger and its handlers. Return the number of rows logged.
+    """
+    message = "; ".join(f"{column}=%s" for column in USER_COLUMNS) + ";"
+    rows = 0
+    for batch in _user_batches(db, batch_size):
+        for row in batch:
+            logger.info(message, *row)
+        rows += len(batch)
+    return rows
+
+def export_users(db, stream: TextIO = None, batch_size: int = 1000) -> int:
+    """ Write the users table to stream in the filtered log format
+
+    Rows are streamed from the server by an unbuffered cursor in
+    batches of batch_size, so memory does not grow with the table.
+    Each batch is formatted, redacted and written at once, with the log
+    prefix computed once per batch, bypassing the logger handlers.
+    Return the number of rows written.
+    """
+    if stream is None:
+        stream = sys.stderr
+    formatter = RedactingFormatter(fields=PII_FIELDS, split=True)
+    line = "; ".join(f"{column}={{}}" for column in USER_COLUMNS) + ";"
+    rows = 0
+
+    for batch in _user_batches(db, batch_size):
+        record = logging.LogRecord("user_data", logging.INFO, __file__,
+                                   0, "", None, None)
+        prefix = logging.Formatter.format(formatter, record)
+        lines = formatter.redact("\n".join(
+            line.format(*row) for row in batch)).split("\n")
+        stream.write("".join(f"{prefix}{text}\n" for text in lines))
+        rows += len(batch)
+    stream.flush()
+
+    return rows
+
 def main() -> None:
-    """ Retrieve all rows in the users table and display each row under a filtered format """
-    logger = get_logger()
+    """ Retrieve all rows in the users table and display each row under a filtered format
+
+    PERSONAL_DATA_EXPORT: "log" (default) logs each row with get_logger(),
+    "stream" writes batches straight to stderr with export_users().
+    Rows are fetched in batches of PERSONAL_DATA_EXPORT_BATCH_SIZE
+    (default 1000) and the rows/s rate is reported the same way.
+    """
+    mode = os.getenv("PERSONAL_DATA_EXPORT", "log")
+    batch_size = int(os.getenv("PERSONAL_DATA_EXPORT_BATCH_SIZE", 1000))
+    logger = get_logger() if mode != "stream" else None
     db = get_db()
 
-    cursor = db.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users;")
-    
-    for row in cursor:
-        logger.info("name=%s; email=%s; phone=%s; ssn=%s; password=%s; ip=%s; last_login=%s; user_agent=%s;",
-                    row["name"], row["email"], row["phone"], row["ssn"], row["password"],
-                    row["ip"], row["last_login"], row["user_agent"])
+    start = time.perf_counter()
+    try:
+        if logger is None:
+            rows = export_users(db, batch_size=batch_size)
+        else:
+            rows = log_users(db, logger, batch_size=batch_size)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
 
-    cursor.close()
-    db.close()
+    stats = (f"{rows} rows in {elapsed:.2f}s "
+             f"({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    if logger is None:
+        sys.stderr.write(stats + "\n")
+    else:
+        logger.info(stats)
 
 if __name__ == "__main__":
     main()
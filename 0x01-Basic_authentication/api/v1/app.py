@@ -14,6 +14,9 @@ app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
 auth = None
 AUTH_TYPE = getenv("AUTH_TYPE")
+EXCLUDED_PATHS = ('/api/v1/status/',
+                  '/api/v1/unauthorized/',
+                  '/api/v1/forbidden/')
 
 if AUTH_TYPE == "auth":
     from api.v1.auth.auth import Auth
@@ -22,6 +25,9 @@ elif AUTH_TYPE == "basic_auth":
     from api.v1.auth.basic_auth import BasicAuth
     auth = BasicAuth()
 
+if auth is not None:
+    auth.excluded_paths(EXCLUDED_PATHS)
+
 
 @app.errorhandler(404)
 def not_found(error) -> str:
@@ -52,11 +58,7 @@ def before_request() -> str:
     if auth is None:
         return
 
-    excluded_paths = ['/api/v1/status/',
-                      '/api/v1/unauthorized/',
-                      '/api/v1/forbidden/']
-
-    if not auth.require_auth(request.path, excluded_paths):
+    if not auth.require_auth(request.path, EXCLUDED_PATHS):
         return
 
     if auth.authorization_header(request) is None:
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+""" Module of JSON encoding for bulk responses
+
+dumps() returns compact UTF-8 JSON bytes, encoded by orjson when it is
+installed and API_JSON_ENCODER is auto (default) or orjson, by the
+standard library json module otherwise
+"""
+from os import getenv
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    """ Compact JSON bytes encoded by the standard library """
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+if orjson is not None and \
+        getenv("API_JSON_ENCODER", "auto") in ("auto", "orjson"):
+    ENCODER = "orjson"
+    dumps = orjson.dumps
+else:
+    ENCODER = "json"
+    dumps = _json_dumps
@@ -1,19 +1,87 @@
 #!/usr/bin/env python3
 """ Module of Users views
 """
+from api.v1.json_encoder import dumps
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from flask import abort, jsonify, request, Response
+from itertools import islice
 from models.user import User
 
+CHUNK_SIZE = 1000
+MAX_LIMIT = 1000
+
+
+def _chunks(users):
+    """ Yield lists of CHUNK_SIZE users
+    """
+    users = iter(users)
+    while True:
+        chunk = list(islice(users, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _json_array(users):
+    """ Yield a compact JSON array of users, one encoded chunk of
+    users at a time
+    """
+    yield b"["
+    separator = b""
+    for chunk in _chunks(users):
+        yield separator + dumps([user.to_json() for user in chunk])[1:-1]
+        separator = b","
+    yield b"]\n"
+
+
+def _ndjson(users):
+    """ Yield one compact JSON user per line, one chunk at a time
+    """
+    for chunk in _chunks(users):
+        yield b"\n".join([dumps(user.to_json()) for user in chunk]) + b"\n"
+
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters (optional):
+      - limit: maximum number of users returned (at most MAX_LIMIT)
+      - cursor: ID of the last user of the previous page
+      - format: json (default) or ndjson
     Return:
-      - list of all User objects JSON represented
+      - list of User objects JSON represented, ordered by ID and
+        streamed without building the whole list (compact, never
+        pretty printed)
+      - header X-Next-Cursor if more users are available
+      - 400 if limit or format is invalid
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    fmt = request.args.get('format', 'json')
+
+    if fmt not in ('json', 'ndjson'):
+        return jsonify({'error': "Wrong format"}), 400
+
+    users = User.iterate(cursor)
+    headers = {}
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit <= 0 or limit > MAX_LIMIT:
+            return jsonify({'error': "Wrong limit"}), 400
+        page = list(islice(users, limit + 1))
+        if len(page) > limit:
+            page = page[:limit]
+            headers['X-Next-Cursor'] = page[-1].id
+        users = page
+
+    if fmt == 'ndjson':
+        return Response(_ndjson(users), mimetype='application/x-ndjson',
+                        headers=headers)
+    return Response(_json_array(users), mimetype='application/json',
+                    headers=headers)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -118,5 +186,8 @@ def update_user(user_id: str = None) -> str:
         user.first_name = rj.get('first_name')
     if rj.get('last_name') is not None:
         user.last_name = rj.get('last_name')
-    user.save()
+    try:
+        user.save()
+    except ValueError as e:
+        return jsonify({'error': "Can't update User: {}".format(e)}), 400
     return jsonify(user.to_json()), 200
@@ -1,40 +1,99 @@
 #!/usr/bin/env python3
 """ Base module
 """
+from concurrent.futures import Future
 from datetime import datetime
-from typing import TypeVar, List, Iterable
-from os import path
-import json
+from functools import lru_cache
+from models.engine import storage
+from operator import attrgetter
+from typing import Callable, TypeVar, List, Iterable, Iterator
 import uuid
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
-DATA = {}
+TIMESTAMP_ATTRIBUTES = ('created_at', 'updated_at')
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: str) -> datetime:
+    """ Parse a stored timestamp: equal timestamps (objects created in
+    the same second, created_at == updated_at) share one datetime
+    """
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=65536)
+def format_timestamp(value: datetime) -> str:
+    """ Format a timestamp for API responses: a bounded cache, keyed by
+    the datetime itself, so a new updated_at is formatted again
+    """
+    return value.strftime(TIMESTAMP_FORMAT)
 
 
 class Base():
     """ Base class
+
+    Models declare their attributes in __slots__: objects have no
+    __dict__, which saves memory when millions of them are loaded
     """
+    __slots__ = ('id', 'created_at', 'updated_at')
+    INDEXES = {}
+    _listeners = []
+    _fields = {}
+    _serializers = {}
 
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
-        s_class = str(self.__class__.__name__)
-        if DATA.get(s_class) is None:
-            DATA[s_class] = {}
-
         self.id = kwargs.get('id', str(uuid.uuid4()))
-        if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
+        created_at = kwargs.get('created_at')
+        if created_at is not None:
+            self.created_at = parse_timestamp(created_at)
         else:
             self.created_at = datetime.utcnow()
-        if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
+        updated_at = kwargs.get('updated_at')
+        if updated_at is not None:
+            self.updated_at = parse_timestamp(updated_at)
         else:
             self.updated_at = datetime.utcnow()
 
+    @classmethod
+    def fields(cls) -> tuple:
+        """ Return the attribute names __init__ sets, in order
+        """
+        fields = Base._fields.get(cls)
+        if fields is None:
+            obj = cls()
+            fields = [name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get('__slots__', ())
+                      if hasattr(obj, name)]
+            fields += [name for name in getattr(obj, '__dict__', {})
+                       if name not in fields]
+            fields = Base._fields[cls] = tuple(fields)
+        return fields
+
+    @classmethod
+    def from_json(cls, obj_json: dict) -> TypeVar('Base'):
+        """ Build an object from its to_json(True) dictionary without
+        calling __init__: the attributes __init__ would set are copied
+        (None if missing) and the timestamps are parsed with
+        parse_timestamp
+        """
+        obj = cls.__new__(cls)
+        get = obj_json.get
+        for key in cls.fields():
+            setattr(obj, key, get(key))
+        for key in TIMESTAMP_ATTRIBUTES:
+            value = get(key)
+            if value is None:
+                setattr(obj, key, datetime.utcnow())
+            elif type(value) is str:
+                setattr(obj, key, parse_timestamp(value))
+        if obj.id is None:
+            obj.id = str(uuid.uuid4())
+        return obj
+
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """ Equality
         """
@@ -44,12 +103,60 @@ class Base():
             return False
         return (self.id == other.id)
 
+    @classmethod
+    def serializer(cls, for_serialization: bool = False) -> Callable:
+        """ Return the to_json function of the class, with the attribute
+        names resolved once, or None if objects of the class have a
+        __dict__ (their attributes are only known at run time).
+        Timestamps of API responses go through the format_timestamp
+        cache; the persistence path (for_serialization) formats them
+        directly, so saving all objects does not fill the cache
+        """
+        key = (cls, for_serialization)
+        if key in Base._serializers:
+            return Base._serializers[key]
+
+        serializer = None
+        if all('__slots__' in klass.__dict__
+               for klass in cls.__mro__ if klass is not object):
+            names = tuple(name for name in cls.fields()
+                          if for_serialization or name[0] != '_')
+            values = attrgetter(*names)
+            if for_serialization:
+                def format_value(value: datetime) -> str:
+                    return value.strftime(TIMESTAMP_FORMAT)
+            else:
+                format_value = format_timestamp
+
+            def serializer(obj: Base) -> dict:
+                result = dict(zip(names, values(obj)))
+                result['created_at'] = format_value(obj.created_at)
+                result['updated_at'] = format_value(obj.updated_at)
+                return result
+
+        Base._serializers[key] = serializer
+        return serializer
+
     def to_json(self, for_serialization: bool = False) -> dict:
         """ Convert the object a JSON dictionary
         """
+        serializer = self.serializer(for_serialization)
+        if serializer is not None:
+            return serializer(self)
+
         result = {}
-        for key, value in self.__dict__.items():
-            if not for_serialization and key[0] == '_':
+        for key in self.fields():
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING or \
+                    (not for_serialization and key[0] == '_'):
+                continue
+            if type(value) is datetime:
+                result[key] = value.strftime(TIMESTAMP_FORMAT)
+            else:
+                result[key] = value
+        for key, value in getattr(self, '__dict__', {}).items():
+            if key in result or \
+                    (not for_serialization and key[0] == '_'):
                 continue
             if type(value) is datetime:
                 result[key] = value.strftime(TIMESTAMP_FORMAT)
@@ -57,81 +164,107 @@ class Base():
                 result[key] = value
         return result
 
+    @staticmethod
+    def add_listener(listener: Callable[[type, TypeVar('Base')], None]):
+        """ Register listener(cls, obj), called after an object is saved
+        or removed, and with obj None after all objects of cls have been
+        (re)loaded from file
+        """
+        Base._listeners.append(listener)
+
+    @classmethod
+    def _notify(cls, obj: TypeVar('Base') = None):
+        """ Call the listeners for one object, or all objects if None
+        """
+        for listener in Base._listeners:
+            listener(cls, obj)
+
     @classmethod
     def load_from_file(cls):
         """ Load all objects from file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
-
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+        storage.load(cls)
+        cls._notify()
 
     @classmethod
     def save_to_file(cls):
         """ Save all objects to file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        storage.save_all(cls)
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def reload_from_file(cls, force: bool = False) -> bool:
+        """ Reload all objects from file only if the file changed
+        (inode, mtime or size) since the last load/save
+        Return True if objects have been reloaded
+        """
+        reloaded = storage.reload(cls, force)
+        if reloaded:
+            cls._notify()
+        return reloaded
+
+    @classmethod
+    def invalidate_file_cache(cls):
+        """ Force the next reload_from_file to read the file again
+        """
+        storage.invalidate(cls)
 
-    def save(self):
+    def save(self, wait: bool = True) -> Future:
         """ Save current object
+        wait: block until the object is on disk
+        Return a future resolved once the object is on disk
         """
-        s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        future = storage.save(self)
+        self._notify(self)
+        if wait:
+            future.result()
+        return future
 
-    def remove(self):
+    def remove(self, wait: bool = True) -> Future:
         """ Remove object
+        wait: block until the removal is on disk
+        Return a future resolved once the removal is on disk
         """
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        future = storage.remove(self)
+        self._notify(self)
+        if wait:
+            future.result()
+        return future
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return storage.count(cls)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
         """ Return all objects
         """
-        return cls.search()
+        return storage.all(cls)
+
+    @classmethod
+    def iterate(cls, after: str = None) -> Iterator[TypeVar('Base')]:
+        """ Yield all objects ordered by ID, starting after the ID `after`
+        """
+        return storage.iterate(cls, after)
 
     @classmethod
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return storage.get(cls, id)
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
-        s_class = cls.__name__
-        def _search(obj):
-            if len(attributes) == 0:
-                return True
-            for k, v in attributes.items():
-                if (getattr(obj, k) != v):
-                    return False
-            return True
-        
-        return list(filter(_search, DATA[s_class].values()))
+        return storage.search(cls, attributes)
+
+    @classmethod
+    def explain(cls, attributes: dict = {}) -> dict:
+        """ Describe how search() answers a query: which index is used
+        and how many objects are filtered
+        """
+        return storage.explain(cls, attributes)
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+""" Storage engine of the models
+
+MODELS_ENGINE: json (default) or sqlite
+MODELS_STORAGE: file (default) or journal, for the json engine
+MODELS_SQLITE_PATH: database file of the sqlite engine
+"""
+from os import getenv
+
+
+if getenv("MODELS_ENGINE", "json") == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage(getenv("MODELS_SQLITE_PATH", ".db.sqlite3"))
+else:
+    from models.engine.json_storage import JSONStorage
+    storage = JSONStorage(getenv("MODELS_STORAGE", "file"))
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+""" JSON file storage module
+"""
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import Future
+from models.engine.journal import Journal
+from models.engine.scheduler import PersistenceScheduler
+from models.engine.storage import Storage, done, matches
+from os import getenv, stat
+from typing import TypeVar, List, Iterator
+import json
+import warnings
+
+
+def _file_signature(file_path: str) -> tuple:
+    """ Return the (inode, mtime, size) signature of a file
+    or None if the file doesn't exist
+    """
+    try:
+        st = stat(file_path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class JSONStorage(Storage):
+    """ In-memory objects persisted in `.db_<Class>.json` files
+
+    mode: 'file' rewrites the whole file (group committed) on every
+    save/remove, 'journal' appends to `.db_<Class>.log`
+    """
+
+    def __init__(self, mode: str = "file"):
+        """ Initialize a JSONStorage instance
+        """
+        self.mode = mode
+        self.data = {}
+        self.indexes = {}
+        self.sorted_ids = {}
+        self.duplicates = {}
+        self.file_stats = {}
+        self.journals = {}
+        self.schedulers = {}
+
+    def objects(self, cls: type) -> dict:
+        """ Return the objects of a class by ID
+        """
+        s_class = cls.__name__
+        if self.data.get(s_class) is None:
+            self.data[s_class] = {}
+        return self.data[s_class]
+
+    def load(self, cls: type):
+        """ Load all objects from file
+        """
+        s_class = cls.__name__
+        file_path = ".db_{}.json".format(s_class)
+        journal = self._journal(cls)
+        self.data[s_class] = {}
+        self.file_stats[s_class] = self._file_signature(cls)
+
+        if journal is not None:
+            objs_json = journal.replay()
+        elif self.file_stats[s_class] is None:
+            objs_json = {}
+        else:
+            with open(file_path, 'r') as f:
+                objs_json = json.load(f)
+
+        objs = self.data[s_class]
+        from_json = cls.from_json
+        for obj_id, obj_json in objs_json.items():
+            objs[obj_id] = from_json(obj_json)
+        self._rebuild_indexes(cls)
+        self.sorted_ids.pop(s_class, None)
+
+    def save_all(self, cls: type):
+        """ Save all objects to file
+        """
+        journal = self._journal(cls)
+        if journal is not None:
+            journal.compact(lambda: self._dump(cls))
+            self.file_stats[cls.__name__] = self._file_signature(cls)
+        else:
+            self._scheduler(cls).write()
+
+    def reload(self, cls: type, force: bool = False) -> bool:
+        """ Reload all objects from file only if the file changed
+        (inode, mtime or size) since the last load/save
+        Return True if objects have been reloaded
+        """
+        s_class = cls.__name__
+        if not force and self.data.get(s_class) is not None \
+                and s_class in self.file_stats \
+                and self.file_stats[s_class] == self._file_signature(cls):
+            return False
+        self.load(cls)
+        return True
+
+    def invalidate(self, cls: type):
+        """ Force the next reload to read the file again
+        """
+        self.file_stats.pop(cls.__name__, None)
+
+    def save(self, obj: TypeVar('Base')) -> Future:
+        """ Save one object
+        """
+        cls = obj.__class__
+        self._check_unique(obj)
+        objs = self.objects(cls)
+        if obj.id not in objs and cls.__name__ in self.sorted_ids:
+            insort(self.sorted_ids[cls.__name__], obj.id)
+        objs[obj.id] = obj
+        self._index_add(obj)
+        return self._persist('save', obj)
+
+    def remove(self, obj: TypeVar('Base')) -> Future:
+        """ Remove one object
+        """
+        objs = self.objects(obj.__class__)
+        if objs.get(obj.id) is None:
+            return done()
+        del objs[obj.id]
+        self._index_remove(obj)
+        ids = self.sorted_ids.get(obj.__class__.__name__)
+        if ids is not None:
+            i = bisect_left(ids, obj.id)
+            if i < len(ids) and ids[i] == obj.id:
+                del ids[i]
+        return self._persist('remove', obj)
+
+    def count(self, cls: type) -> int:
+        """ Count all objects
+        """
+        return len(self.objects(cls).keys())
+
+    def iterate(self, cls: type, after: str = None,
+                chunk: int = 1000) -> Iterator[TypeVar('Base')]:
+        """ Yield the objects ordered by ID, starting after the ID
+        `after`, from the sorted ID list (never copied entirely)
+        """
+        s_class = cls.__name__
+        objs = self.objects(cls)
+        if self.sorted_ids.get(s_class) is None:
+            self.sorted_ids[s_class] = sorted(objs)
+        while True:
+            ids = self.sorted_ids.get(s_class, [])
+            i = 0 if after is None else bisect_right(ids, after)
+            batch = ids[i:i + chunk]
+            if len(batch) == 0:
+                return
+            for obj_id in batch:
+                obj = objs.get(obj_id)
+                if obj is not None:
+                    yield obj
+            after = batch[-1]
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object by ID
+        """
+        return self.objects(cls).get(id)
+
+    def search(self, cls: type,
+               attributes: dict = {}) -> List[TypeVar('Base')]:
+        """ Search all objects with matching attributes, using the
+        most selective index of the query if any
+        """
+        candidates, _ = self._candidates(cls, attributes)
+        if len(attributes) == 0:
+            return candidates
+        return [obj for obj in candidates if matches(obj, attributes)]
+
+    def explain(self, cls: type, attributes: dict = {}) -> dict:
+        """ Describe which index answers a query and how many objects
+        are filtered
+        """
+        candidates, attr = self._candidates(cls, attributes)
+        return {
+            'class': cls.__name__,
+            'index': attr,
+            'unique': cls.INDEXES[attr].get('unique', False)
+            if attr is not None else None,
+            'scanned': len(candidates),
+            'total': self.count(cls),
+            'duplicates': self.duplicates.get(cls.__name__, {}),
+        }
+
+    def _dump(self, cls: type) -> dict:
+        """ Return all objects JSON by ID
+        """
+        objs_json = {}
+        for obj_id, obj in list(self.objects(cls).items()):
+            objs_json[obj_id] = obj.to_json(True)
+        return objs_json
+
+    def _file_signature(self, cls: type) -> tuple:
+        """ Return the signature of the files storing the class
+        """
+        journal = self._journal(cls)
+        if journal is not None:
+            return journal.signature()
+        return _file_signature(".db_{}.json".format(cls.__name__))
+
+    def _journal(self, cls: type) -> Journal:
+        """ Return the journal of the class in 'journal' mode
+        MODELS_FSYNC: always, batched (default) or never
+        MODELS_COMPACT_EVERY: number of logged operations between
+        two background compactions (default 1000)
+        """
+        if self.mode != "journal":
+            return None
+        s_class = cls.__name__
+        if self.journals.get(s_class) is None:
+            self.journals[s_class] = Journal(
+                s_class,
+                fsync=getenv("MODELS_FSYNC", "batched"),
+                compact_every=int(getenv("MODELS_COMPACT_EVERY", 1000)))
+        return self.journals[s_class]
+
+    def _scheduler(self, cls: type) -> PersistenceScheduler:
+        """ Return the group commit scheduler of the class file
+        MODELS_COMMIT_WINDOW_MS: time to wait for more writes before
+        committing a batch (default 0: commit what is pending)
+        MODELS_COMMIT_BATCH: maximum writes per batch (default 64)
+        """
+        s_class = cls.__name__
+        if self.schedulers.get(s_class) is None:
+            def on_written():
+                self.file_stats[s_class] = self._file_signature(cls)
+
+            self.schedulers[s_class] = PersistenceScheduler(
+                ".db_{}.json".format(s_class), lambda: self._dump(cls),
+                on_written,
+                window=float(getenv("MODELS_COMMIT_WINDOW_MS", 0)) / 1000,
+                max_batch=int(getenv("MODELS_COMMIT_BATCH", 64)))
+        return self.schedulers[s_class]
+
+    def _persist(self, op: str, obj: TypeVar('Base')) -> Future:
+        """ Persist one save/remove: appended to the journal
+        or scheduled for the next group commit of the file
+        """
+        cls = obj.__class__
+        journal = self._journal(cls)
+        if journal is None:
+            return self._scheduler(cls).submit()
+
+        if op == 'save':
+            journal.append(op, obj.id, obj.to_json(True))
+        else:
+            journal.append(op, obj.id)
+        if journal.needs_compaction():
+            def on_compacted():
+                self.file_stats[cls.__name__] = self._file_signature(cls)
+
+            journal.compact_in_background(lambda: self._dump(cls),
+                                          on_compacted)
+        self.file_stats[cls.__name__] = self._file_signature(cls)
+        return done()
+
+    def _indexes(self, cls: type) -> dict:
+        """ Return the indexes of the class:
+        attribute -> (value -> {id: object}, id -> value)
+        """
+        s_class = cls.__name__
+        if self.indexes.get(s_class) is None:
+            self.indexes[s_class] = {attr: ({}, {}) for attr in cls.INDEXES}
+        return self.indexes[s_class]
+
+    def _rebuild_indexes(self, cls: type):
+        """ Rebuild all indexes of the class, and record (with a warning)
+        the values of unique indexes shared by several objects in files
+        written before uniqueness was enforced
+        """
+        s_class = cls.__name__
+        self.indexes.pop(s_class, None)
+        for obj in self.objects(cls).values():
+            self._index_add(obj)
+
+        duplicates = {}
+        for attr, (by_value, _) in self._indexes(cls).items():
+            if not cls.INDEXES[attr].get('unique', False):
+                continue
+            count = sum(1 for objs in by_value.values() if len(objs) > 1)
+            if count > 0:
+                duplicates[attr] = count
+        if duplicates:
+            self.duplicates[s_class] = duplicates
+            warnings.warn("{}: duplicate values of unique indexes {}"
+                          .format(s_class, duplicates))
+        else:
+            self.duplicates.pop(s_class, None)
+
+    def _index_add(self, obj: TypeVar('Base')):
+        """ Add (or move) an object in all indexes of its class
+        """
+        for attr, (by_value, by_id) in self._indexes(obj.__class__).items():
+            value = getattr(obj, attr, None)
+            if obj.id in by_id and by_id[obj.id] != value:
+                self._index_discard(by_value, by_id, obj.id)
+            try:
+                by_value.setdefault(value, {})[obj.id] = obj
+            except TypeError:
+                continue
+            by_id[obj.id] = value
+
+    def _index_remove(self, obj: TypeVar('Base')):
+        """ Remove an object from all indexes of its class
+        """
+        for by_value, by_id in self._indexes(obj.__class__).values():
+            self._index_discard(by_value, by_id, obj.id)
+
+    @staticmethod
+    def _index_discard(by_value: dict, by_id: dict, obj_id: str):
+        """ Remove an object ID from one index
+        """
+        if obj_id not in by_id:
+            return
+        value = by_id.pop(obj_id)
+        objs = by_value.get(value)
+        if objs is not None:
+            objs.pop(obj_id, None)
+            if len(objs) == 0:
+                del by_value[value]
+
+    def _check_unique(self, obj: TypeVar('Base')):
+        """ Raise a ValueError if saving obj violates a unique index:
+        only new or changed values are checked, so objects loaded with
+        duplicate values can still be saved as long as they keep them
+        """
+        cls = obj.__class__
+        indexes = self._indexes(cls)
+        for attr, options in cls.INDEXES.items():
+            if not options.get('unique', False):
+                continue
+            value = getattr(obj, attr, None)
+            if value is None:
+                continue
+            by_value, by_id = indexes[attr]
+            if obj.id in by_id and by_id[obj.id] == value:
+                continue
+            try:
+                objs = by_value.get(value, {})
+            except TypeError:
+                continue
+            for obj_id in objs:
+                if obj_id != obj.id:
+                    raise ValueError("{} {} already exists".format(attr,
+                                                                   value))
+
+    def _candidates(self, cls: type, attributes: dict) -> tuple:
+        """ Return the objects to filter for a search and the name
+        of the index used (None for a full scan)
+        """
+        indexes = self._indexes(cls)
+        best = None
+        for attr, value in attributes.items():
+            if attr not in indexes:
+                continue
+            try:
+                objs = indexes[attr][0].get(value, {})
+            except TypeError:
+                continue
+            if best is None or len(objs) < len(best[1]):
+                best = (attr, objs)
+        if best is None:
+            return list(self.objects(cls).values()), None
+        return list(best[1].values()), best[0]
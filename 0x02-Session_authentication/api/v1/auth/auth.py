@@ -2,40 +2,77 @@
 """ Module of Authentication
 """
 from flask import request
-from typing import List, TypeVar
+from typing import List, TypeVar, Iterable
 import os
 
+
+class ExcludedPaths:
+    """ Excluded paths compiled once: exact paths in a frozenset and
+    wildcard prefixes (ending with '*') in a character trie, so that a
+    lookup costs O(len(path)) whatever the number of exclusions
+    """
+
+    def __init__(self, excluded_paths: Iterable[str]):
+        """ Compiles the excluded paths """
+        exact = set()
+        self.trie = {}
+        self.match_all = False
+        for exc in excluded_paths:
+            if len(exc) == 0:
+                continue
+            if exc[-1] != '*':
+                exact.add(exc)
+                continue
+            node = self.trie
+            for char in exc[:-1]:
+                node = node.setdefault(char, {})
+            node[None] = True
+            if node is self.trie:
+                self.match_all = True
+        self.exact = frozenset(exact)
+
+    def match(self, path: str) -> bool:
+        """ True if path is excluded """
+        tmp_path = path if path[-1] == '/' else path + '/'
+        if tmp_path in self.exact or self.match_all:
+            return True
+
+        node = self.trie
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+
 class Auth:
     """ Class to manage the API authentication """
+    _compiled = (None, None)
 
     def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
-        """ Method for validating if endpoint requires auth """
-        if path is None or excluded_paths is None or excluded_paths == []:
+        """ Method for validating if endpoint requires auth
+        excluded_paths given as a tuple are compiled once and reused
+        """
+        if path is None or excluded_paths is None or \
+                len(excluded_paths) == 0:
             return True
 
-        l_path = len(path)
-        if l_path == 0:
+        if len(path) == 0:
             return True
 
-        slash_path = True if path[l_path - 1] == '/' else False
-
-        tmp_path = path
-        if not slash_path:
-            tmp_path += '/'
-
-        for exc in excluded_paths:
-            l_exc = len(exc)
-            if l_exc == 0:
-                continue
+        return not self.excluded_paths(excluded_paths).match(path)
 
-            if exc[l_exc - 1] != '*':
-                if tmp_path == exc:
-                    return False
-            else:
-                if exc[:-1] == path[:l_exc - 1]:
-                    return False
-
-        return True
+    def excluded_paths(self, excluded_paths: Iterable[str]) -> ExcludedPaths:
+        """ Returns the compiled matcher of excluded paths """
+        compiled_paths, matcher = self._compiled
+        if compiled_paths is excluded_paths:
+            return matcher
+        matcher = ExcludedPaths(excluded_paths)
+        if isinstance(excluded_paths, tuple):
+            self._compiled = (excluded_paths, matcher)
+        return matcher
 
     def authorization_header(self, request=None) -> str:
         """ Method that handles authorization header """
@@ -48,6 +85,10 @@ class Auth:
         """ Validates current user """
         return None
 
+    def metrics(self) -> dict:
+        """ Returns the metrics of the authentication """
+        return {}
+
     def session_cookie(self, request=None):
         """ Return the value of the session cookie from the request """
         if request is None:
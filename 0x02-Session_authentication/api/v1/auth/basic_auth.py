@@ -2,13 +2,18 @@
 """ Module of Basic Authentication
 """
 from api.v1.auth.auth import Auth
+from api.v1.auth.credential_cache import CredentialCache
 from base64 import b64decode
 from models.user import User
+from os import getenv
 from typing import TypeVar
 
 
 class BasicAuth(Auth):
     """ Basic Authentication Class """
+    credential_cache = CredentialCache(
+        int(getenv("BASIC_AUTH_CACHE_SIZE", 1024)),
+        float(getenv("BASIC_AUTH_CACHE_TTL", 300)))
 
     def extract_base64_authorization_header(self,
                                             authorization_header: str) -> str:
@@ -96,6 +101,27 @@ class BasicAuth(Auth):
         if not auth_header:
             return None
 
+        key = self.credential_cache.key(auth_header)
+        cached = self.credential_cache.get(key)
+        if cached is not None:
+            user_id, fingerprint = cached
+            user = User.get(user_id)
+            if user is not None and \
+                    (user.email, user.password) == fingerprint:
+                return user
+            self.credential_cache.invalidate(key)
+
+        user = self._user_from_authorization_header(auth_header)
+
+        if user is not None:
+            self.credential_cache.set(key, user.id,
+                                      (user.email, user.password))
+
+        return user
+
+    def _user_from_authorization_header(self, auth_header: str
+                                        ) -> TypeVar('User'):
+        """ Decodes and verifies the credentials of a header """
         encoded = self.extract_base64_authorization_header(auth_header)
 
         if not encoded:
@@ -114,3 +140,7 @@ class BasicAuth(Auth):
         user = self.user_object_from_credentials(email, pwd)
 
         return user
+
+    def metrics(self) -> dict:
+        """ Returns the credential cache counters """
+        return {'credential_cache': self.credential_cache.info()}
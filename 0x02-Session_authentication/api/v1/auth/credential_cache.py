@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+""" Module of Credential Cache
+"""
+from collections import OrderedDict
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+
+class CredentialCache:
+    """ Bounded LRU/TTL cache of verified Authorization headers
+
+    Keys are a keyed hash (HMAC-SHA256 with a per-process secret) of the
+    raw header, so credentials are never kept in memory. Each entry holds
+    the user ID and a fingerprint (email, password hash) of the verified
+    user: a changed fingerprint means the entry is stale.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300):
+        """ Initialize a CredentialCache instance """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._secret = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, authorization_header: str) -> bytes:
+        """ Returns the keyed hash of an Authorization header """
+        return hmac.new(self._secret, authorization_header.encode('utf-8'),
+                        hashlib.sha256).digest()
+
+    def get(self, key: bytes) -> tuple:
+        """ Returns (user_id, fingerprint) of a live entry, or None """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def set(self, key: bytes, user_id: str, fingerprint: tuple):
+        """ Caches a verified header """
+        with self._lock:
+            self._entries[key] = (user_id, fingerprint,
+                                  time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: bytes):
+        """ Removes one entry """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """ Removes all entries """
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict:
+        """ Returns the cache counters """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
@@ -3,13 +3,31 @@
 """ Module of Session Authentication
 """
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import SessionRecord, session_store
+from api.v1.auth.session_user_cache import SessionUserCache
 from models.user import User
+from os import getenv
 import uuid
 
 
 class SessionAuth(Auth):
-    """Session Authentication Class"""
-    user_id_by_session_id = {}
+    """Session Authentication Class
+
+    Sessions live in the store selected by SESSION_STORE, shared by all
+    instances: a bounded in-memory SessionStore (SESSION_MAX_ENTRIES,
+    default 100000, and SESSION_MAX_BYTES, default 0 for unbounded,
+    evicting least recently used sessions) or a SQLiteSessionStore
+    shared by all worker processes
+
+    current_user resolves a session cookie to its User through a
+    SessionUserCache (SESSION_USER_CACHE_SIZE, default 10000, and
+    SESSION_USER_CACHE_TTL, default 5 seconds), whose entries are
+    dropped when the store evicts their sessions
+    """
+    user_cache = SessionUserCache(
+        int(getenv("SESSION_USER_CACHE_SIZE", 10000)),
+        float(getenv("SESSION_USER_CACHE_TTL", 5)))
+    user_id_by_session_id = session_store(user_cache.invalidate)
 
     def create_session(self, user_id: str = None) -> str:
         """Creates a Session ID for a user_id"""
@@ -19,29 +37,54 @@ class SessionAuth(Auth):
 
         session_id = str(uuid.uuid4())
 
-        self.user_id_by_session_id[session_id] = user_id
+        self.user_id_by_session_id.set(session_id, user_id,
+                                       self.session_expires_at())
 
         return session_id
 
+    def session_expires_at(self) -> int:
+        """Returns the expiry epoch of a new session, 0 for never"""
+        return 0
+
+    def session_record(self, session_id: str) -> SessionRecord:
+        """Returns the record (user ID, expiry) of a live session"""
+        return self.user_id_by_session_id.get(session_id)
+
     def user_id_for_session_id(self, session_id: str = None) -> str:
         """Returns a User ID based on a Session ID"""
 
         if session_id is None or not isinstance(session_id, str):
             return None
 
-        return self.user_id_by_session_id.get(session_id)
+        record = self.session_record(session_id)
+
+        if record is None:
+            return None
+
+        return record.user_id
 
     def current_user(self, request=None):
         """Returns a User instance based on a cookie value"""
 
         session_id = self.session_cookie(request)
 
-        if session_id is None:
+        if session_id is None or not isinstance(session_id, str):
             return None
 
-        user_id = self.user_id_for_session_id(session_id)
+        user = self.user_cache.get(session_id)
+        if user is not None:
+            return user
 
-        return User.get(user_id)
+        record = self.session_record(session_id)
+
+        if record is None:
+            return None
+
+        user = User.get(record.user_id)
+        if user is not None:
+            self.user_cache.set(session_id, user, record.expires_at)
+
+        return user
 
     def destroy_session(self, request=None):
         """Deletes de user session / logout"""
@@ -58,9 +101,12 @@ class SessionAuth(Auth):
         if not user_id:
             return False
 
-        try:
-            del self.user_id_by_session_id[session_id]
-        except Exception:
-            pass
+        self.user_id_by_session_id.pop(session_id)
+        self.user_cache.invalidate(session_id)
 
         return True
+
+    def metrics(self) -> dict:
+        """Returns the live session count and memory estimate"""
+        return {'sessions': self.user_id_by_session_id.metrics(),
+                'user_cache': self.user_cache.info()}
@@ -2,13 +2,33 @@
 """ Module of Session in Database
 """
 from api.v1.auth.session_exp_auth import SessionExpAuth
+from api.v1.auth.session_store import SessionRecord
 from datetime import datetime, timedelta
 from models.user_session import UserSession
 
 
+EPOCH = datetime(1970, 1, 1)
+
+
 class SessionDBAuth(SessionExpAuth):
     """Session in database Class"""
 
+    def _user_session(self, session_id):
+        """Returns the UserSession of a Session ID, reloading sessions
+        only if the database file changed on disk
+        """
+        UserSession.reload_from_file()
+        user_session = UserSession.search({'session_id': session_id})
+
+        if not user_session:
+            return None
+
+        return user_session[0]
+
+    def invalidate_sessions(self):
+        """Force the next lookup to reload sessions from the database"""
+        UserSession.invalidate_file_cache()
+
     def create_session(self, user_id=None):
         """Creation session database"""
         session_id = super().create_session(user_id)
@@ -16,35 +36,29 @@ class SessionDBAuth(SessionExpAuth):
         if session_id is None:
             return None
 
+        UserSession.reload_from_file()
+
         kwargs = {'user_id': user_id, 'session_id': session_id}
         user_session = UserSession(**kwargs)
         user_session.save()
-        UserSession.save_to_file()
 
         return session_id
 
-    def user_id_for_session_id(self, session_id=None):
-        """User ID for Session ID Database"""
-        if session_id is None:
-            return None
-
-        UserSession.load_from_file()
-        user_session = UserSession.search({
-            'session_id': session_id
-        })
+    def session_record(self, session_id: str) -> SessionRecord:
+        """Record of a Session ID from the Database"""
+        user_session = self._user_session(session_id)
 
-        if not user_session:
+        if user_session is None:
             return None
 
-        user_session = user_session[0]
-
         expired_time = user_session.created_at + \
             timedelta(seconds=self.session_duration)
 
         if expired_time < datetime.utcnow():
             return None
 
-        return user_session.user_id
+        return SessionRecord(user_session.user_id,
+                             int((expired_time - EPOCH).total_seconds()))
 
     def destroy_session(self, request=None):
         """Remove Session from Database"""
@@ -60,19 +74,15 @@ class SessionDBAuth(SessionExpAuth):
         if not user_id:
             return False
 
-        user_session = UserSession.search({
-            'session_id': session_id
-        })
+        user_session = self._user_session(session_id)
 
-        if not user_session:
+        if user_session is None:
             return False
 
-        user_session = user_session[0]
-
         try:
             user_session.remove()
-            UserSession.save_to_file()
         except Exception:
             return False
+        self.user_cache.invalidate(session_id)
 
         return True
@@ -2,13 +2,22 @@
 """ Module of Expiration of Session Authentication
 """
 from api.v1.auth.session_auth import SessionAuth
-from datetime import datetime, timedelta
+from api.v1.auth.session_store import SessionRecord
 from models.user import User
 from os import getenv
+import threading
+import time
 
 
 class SessionExpAuth(SessionAuth):
-    """Session Expiration Class"""
+    """Session Expiration Class
+
+    Expired sessions are evicted from the session store in O(expired):
+    on every session creation and, if SESSION_SWEEP_INTERVAL is set,
+    by a background sweeper thread
+    """
+    _sweeper = None
+    _sweeper_lock = threading.Lock()
 
     def __init__(self):
         """Constructor Method"""
@@ -21,48 +30,55 @@ class SessionExpAuth(SessionAuth):
 
         self.session_duration = session_duration
 
-    def create_session(self, user_id=None):
-        """Creation session with expiration"""
-
-        session_id = super().create_session(user_id)
-
-        if session_id is None:
-            return None
-
-        session_dictionary = {
-            "user_id": user_id,
-            "created_at": datetime.now()
-        }
-
-        self.user_id_by_session_id[session_id] = session_dictionary
-
-        return session_id
-
-    def user_id_for_session_id(self, session_id=None):
-        """gets user_id from session_id"""
-
-        if session_id is None:
-            return None
-
-        if session_id not in self.user_id_by_session_id.keys():
-            return None
-
-        session_dictionary = self.user_id_by_session_id.get(session_id)
+        try:
+            sweep_interval = float(getenv('SESSION_SWEEP_INTERVAL', 0))
+        except Exception:
+            sweep_interval = 0
 
-        if session_dictionary is None:
-            return None
+        if self.session_duration > 0 and sweep_interval > 0:
+            self.start_sweeper(sweep_interval)
 
+    def session_expires_at(self) -> int:
+        """Returns the expiry epoch of a new session, 0 for never"""
         if self.session_duration <= 0:
-            return session_dictionary.get('user_id')
+            return 0
+
+        return int(time.time()) + self.session_duration
 
-        created_at = session_dictionary.get('created_at')
+    def session_record(self, session_id: str) -> SessionRecord:
+        """Returns the record of a session, None if it expired"""
+        record = self.user_id_by_session_id.get(session_id)
 
-        if created_at is None:
+        if record is None:
             return None
 
-        expired_time = created_at + timedelta(seconds=self.session_duration)
+        if self.session_duration <= 0 or record.expires_at == 0:
+            return record
 
-        if expired_time < datetime.now():
+        if record.expires_at < time.time():
+            self.user_id_by_session_id.pop(session_id)
             return None
 
-        return session_dictionary.get('user_id')
+        return record
+
+    def sweep(self) -> int:
+        """Evicts the expired sessions
+        Returns the number of evicted sessions
+        """
+        return self.user_id_by_session_id.sweep()
+
+    def start_sweeper(self, interval: float):
+        """Starts the background sweeper thread (once per process)"""
+        with self._sweeper_lock:
+            sweeper = SessionExpAuth._sweeper
+            if sweeper is not None and sweeper.is_alive():
+                return
+
+            def run():
+                while True:
+                    time.sleep(interval)
+                    self.sweep()
+
+            sweeper = threading.Thread(target=run, daemon=True)
+            SessionExpAuth._sweeper = sweeper
+            sweeper.start()
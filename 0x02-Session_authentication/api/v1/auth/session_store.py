@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+""" Module of Session Store
+"""
+from collections import OrderedDict
+from os import getenv
+from typing import Callable
+import heapq
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+
+class SessionRecord:
+    """Compact session record: user ID and expiry as an int epoch
+    (0 if the session never expires)"""
+    __slots__ = ('user_id', 'expires_at')
+
+    def __init__(self, user_id: str, expires_at: int = 0):
+        """Constructor Method"""
+        self.user_id = user_id
+        self.expires_at = expires_at
+
+
+class SessionStore:
+    """Bounded in-memory session store
+
+    Sessions are keyed by the 16 bytes of their UUID and kept in LRU
+    order: when max_entries or max_bytes is reached, the least recently
+    used session is evicted. Expiry times are indexed in a timer wheel
+    (one bucket of keys per expiry second, bucket times in a min-heap)
+    so expired sessions are evicted in O(expired) by sweep(). Keys of
+    sessions removed before their expiry stay in their bucket until
+    the wheel is compacted, once they outnumber the live keys plus
+    STALE_SLACK; bytes counts them.
+    on_evict, if set, is called with the Session ID of every session
+    evicted or swept, once the store lock is released.
+    """
+    ENTRY_OVERHEAD = 104
+    BUCKET_ENTRY_OVERHEAD = 8
+    STALE_SLACK = 1024
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0,
+                 on_evict: Callable[[str], None] = None):
+        """Constructor Method, 0 means unbounded"""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.bytes = 0
+        self.evicted = 0
+        self.expired = 0
+        self._entries = OrderedDict()
+        self._expiry_buckets = {}
+        self._expiry_heap = []
+        self._bucket_entries = 0
+        self._expiring = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(session_id: str) -> bytes:
+        """Returns the 16 bytes key of a Session ID, None if it is not
+        a UUID in canonical form (other spellings of the same UUID are
+        different Session IDs)
+        """
+        try:
+            value = uuid.UUID(session_id)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        if str(value) != session_id:
+            return None
+        return value.bytes
+
+    def set(self, session_id: str, user_id: str, expires_at: int = 0):
+        """Stores a session, evicting LRU sessions when full"""
+        key = self.key(session_id)
+        if key is None:
+            return
+
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            record = SessionRecord(user_id, expires_at)
+            self._entries[key] = record
+            self.bytes += self._size(key, record)
+            if expires_at:
+                bucket = self._expiry_buckets.get(expires_at)
+                if bucket is None:
+                    bucket = self._expiry_buckets[expires_at] = []
+                    heapq.heappush(self._expiry_heap, expires_at)
+                bucket.append(key)
+                self._bucket_entries += 1
+                self._expiring += 1
+                self.bytes += self.BUCKET_ENTRY_OVERHEAD
+            self._compact_expiry_buckets()
+
+            while len(self._entries) > 1 and (
+                    (self.max_entries and
+                     len(self._entries) > self.max_entries) or
+                    (self.max_bytes and self.bytes > self.max_bytes)):
+                evicted_key = next(iter(self._entries))
+                self._discard(evicted_key)
+                evicted.append(evicted_key)
+                self.evicted += 1
+
+        self._notify_evicted(evicted)
+        self.sweep()
+
+    def get(self, session_id: str) -> SessionRecord:
+        """Returns the record of a session and marks it as recently used"""
+        key = self.key(session_id)
+        if key is None:
+            return None
+
+        with self._lock:
+            record = self._entries.get(key)
+            if record is not None:
+                self._entries.move_to_end(key)
+            return record
+
+    def pop(self, session_id: str) -> SessionRecord:
+        """Removes a session and returns its record"""
+        key = self.key(session_id)
+        if key is None:
+            return None
+
+        with self._lock:
+            record = self._discard(key)
+            self._compact_expiry_buckets()
+            return record
+
+    def sweep(self, now: int = None) -> int:
+        """Evicts the expired sessions at the top of the expiry heap
+        Returns the number of evicted sessions
+        """
+        if now is None:
+            now = int(time.time())
+
+        evicted = []
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0] <= now:
+                expires_at = heapq.heappop(heap)
+                bucket = self._expiry_buckets.pop(expires_at, ())
+                self._bucket_entries -= len(bucket)
+                self.bytes -= len(bucket) * self.BUCKET_ENTRY_OVERHEAD
+                for key in bucket:
+                    record = self._entries.get(key)
+                    if record is not None and \
+                            record.expires_at == expires_at:
+                        self._discard(key)
+                        evicted.append(key)
+            self.expired += len(evicted)
+
+        self._notify_evicted(evicted)
+        return len(evicted)
+
+    def metrics(self) -> dict:
+        """Returns the live session count and memory estimate"""
+        with self._lock:
+            return {
+                'live_sessions': len(self._entries),
+                'expiry_buckets': len(self._expiry_heap),
+                'stale_expiry_keys': self._bucket_entries - self._expiring,
+                'expired_sessions': self.expired,
+                'evicted_sessions': self.evicted,
+                'memory_bytes': self.bytes +
+                sys.getsizeof(self._expiry_buckets) +
+                sys.getsizeof(self._expiry_heap),
+            }
+
+    def __len__(self) -> int:
+        """Number of live sessions"""
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        """True if the session is stored"""
+        return self.key(session_id) in self._entries
+
+    def _notify_evicted(self, keys: list):
+        """Reports evicted keys to on_evict, without holding the lock"""
+        if self.on_evict is None:
+            return
+        for key in keys:
+            self.on_evict(str(uuid.UUID(bytes=key)))
+
+    def _discard(self, key: bytes) -> SessionRecord:
+        """Removes a key, the caller holds the lock"""
+        record = self._entries.pop(key, None)
+        if record is not None:
+            self.bytes -= self._size(key, record)
+            if record.expires_at:
+                self._expiring -= 1
+        return record
+
+    def _compact_expiry_buckets(self):
+        """Drops the stale keys of the timer wheel once they outnumber
+        the live keys plus STALE_SLACK, the caller holds the lock
+        """
+        if self._bucket_entries - self._expiring <= \
+                self._expiring + self.STALE_SLACK:
+            return
+
+        entries = self._entries
+        buckets = {}
+        for expires_at, bucket in self._expiry_buckets.items():
+            live = [key for key in dict.fromkeys(bucket)
+                    if key in entries and
+                    entries[key].expires_at == expires_at]
+            if live:
+                buckets[expires_at] = live
+        self._expiry_buckets = buckets
+        self._expiry_heap = list(buckets)
+        heapq.heapify(self._expiry_heap)
+        self.bytes -= (self._bucket_entries - self._expiring) * \
+            self.BUCKET_ENTRY_OVERHEAD
+        self._bucket_entries = self._expiring
+
+    def _size(self, key: bytes, record: SessionRecord) -> int:
+        """Estimated bytes of one entry, without its expiry bucket key"""
+        return self.ENTRY_OVERHEAD + sys.getsizeof(key) + \
+            sys.getsizeof(record) + sys.getsizeof(record.user_id)
+
+
+class SQLiteSessionStore:
+    """Session store shared by all worker processes
+
+    Sessions are rows of a SQLite database in WAL mode (concurrent
+    readers, one writer), keyed by the 16 bytes of their UUID, with an
+    index on the expiry epoch so sweep() deletes in O(expired).
+    set() sweeps at most once every SWEEP_INTERVAL seconds
+    """
+    SWEEP_INTERVAL = 1.0
+
+    def __init__(self, db_path: str = ".db_sessions.sqlite3",
+                 timeout: float = 30):
+        """Constructor Method"""
+        self.db_path = db_path
+        self.timeout = timeout
+        self._next_sweep = 0
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                     "session_id BLOB PRIMARY KEY, "
+                     "user_id TEXT NOT NULL, "
+                     "expires_at INTEGER NOT NULL) WITHOUT ROWID")
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at "
+                     "ON sessions (expires_at) WHERE expires_at > 0")
+
+    key = staticmethod(SessionStore.key)
+
+    def set(self, session_id: str, user_id: str, expires_at: int = 0):
+        """Stores a session"""
+        key = self.key(session_id)
+        if key is None:
+            return
+
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions "
+            "(session_id, user_id, expires_at) VALUES (?, ?, ?)",
+            (key, user_id, expires_at))
+
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.SWEEP_INTERVAL
+            self.sweep(int(now))
+
+    def get(self, session_id: str) -> SessionRecord:
+        """Returns the record of a session"""
+        key = self.key(session_id)
+        if key is None:
+            return None
+
+        row = self._connection().execute(
+            "SELECT user_id, expires_at FROM sessions "
+            "WHERE session_id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        return SessionRecord(row[0], row[1])
+
+    def pop(self, session_id: str) -> SessionRecord:
+        """Removes a session and returns its record"""
+        record = self.get(session_id)
+        if record is not None:
+            self._connection().execute(
+                "DELETE FROM sessions WHERE session_id = ?",
+                (self.key(session_id),))
+        return record
+
+    def sweep(self, now: int = None) -> int:
+        """Deletes the expired sessions
+        Returns the number of deleted sessions
+        """
+        if now is None:
+            now = int(time.time())
+
+        cursor = self._connection().execute(
+            "DELETE FROM sessions WHERE expires_at > 0 AND expires_at <= ?",
+            (now,))
+        return cursor.rowcount
+
+    def metrics(self) -> dict:
+        """Returns the live session count"""
+        return {'live_sessions': len(self), 'store': 'sqlite'}
+
+    def __len__(self) -> int:
+        """Number of stored sessions"""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __contains__(self, session_id: str) -> bool:
+        """True if the session is stored"""
+        return self.get(session_id) is not None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+def session_store(on_evict: Callable[[str], None] = None):
+    """Returns the session store selected by SESSION_STORE:
+    memory (default, per process, reporting evicted sessions to
+    on_evict) or sqlite (SESSION_STORE_PATH, shared by all worker
+    processes, never evicting live sessions)
+    """
+    SESSION_STORE = getenv("SESSION_STORE", "memory")
+
+    if SESSION_STORE == "sqlite":
+        return SQLiteSessionStore(getenv("SESSION_STORE_PATH",
+                                         ".db_sessions.sqlite3"))
+
+    return SessionStore(int(getenv("SESSION_MAX_ENTRIES", 100000)),
+                        int(getenv("SESSION_MAX_BYTES", 0)), on_evict)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+""" Module of Session User Cache
+"""
+from collections import OrderedDict
+from models.base import Base
+from models.user import User
+from models.user_session import UserSession
+import threading
+import time
+
+
+class SessionUserCache:
+    """ Bounded LRU cache of Session ID -> User
+
+    Each entry holds the User object, the session expiry epoch (0 for
+    never) and the time the entry stops being trusted: sessions may be
+    destroyed by another worker process, so an entry is revalidated
+    against the session store at least every ttl seconds. Entries of a
+    user are dropped as soon as the user is saved or removed, and all
+    entries when users or sessions are (re)loaded from file.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 5):
+        """ Initialize a SessionUserCache instance """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._sessions_by_user = {}
+        self._lock = threading.Lock()
+        Base.add_listener(self.on_change)
+
+    def get(self, session_id: str) -> User:
+        """ Returns the User of a live entry, or None """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                user, expires_at, valid_until = entry
+                now = time.time()
+                if valid_until >= now and \
+                        (expires_at == 0 or expires_at >= now):
+                    self._entries.move_to_end(session_id)
+                    self.hits += 1
+                    return user
+                self._discard(session_id)
+            self.misses += 1
+            return None
+
+    def set(self, session_id: str, user: User, expires_at: int = 0):
+        """ Caches the User of a session """
+        with self._lock:
+            self._discard(session_id)
+            self._entries[session_id] = (user, expires_at,
+                                         time.time() + self.ttl)
+            self._sessions_by_user.setdefault(user.id, set()).add(session_id)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, session_id: str):
+        """ Removes the entry of a session """
+        with self._lock:
+            if self._discard(session_id):
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id: str):
+        """ Removes the entries of all sessions of a user """
+        with self._lock:
+            for session_id in self._sessions_by_user.pop(user_id, ()):
+                self._entries.pop(session_id, None)
+                self.invalidations += 1
+
+    def clear(self):
+        """ Removes all entries """
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._sessions_by_user.clear()
+
+    def on_change(self, cls: type, obj: Base = None):
+        """ Base listener: drops the entries a saved or removed User or
+        session depends on
+        """
+        if issubclass(cls, User):
+            if obj is None:
+                self.clear()
+            else:
+                self.invalidate_user(obj.id)
+        elif issubclass(cls, UserSession):
+            if obj is None:
+                self.clear()
+            else:
+                self.invalidate(obj.session_id)
+
+    def info(self) -> dict:
+        """ Returns the cache counters """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
+
+    def _discard(self, session_id: str) -> bool:
+        """ Removes an entry, the caller holds the lock """
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        sessions = self._sessions_by_user.get(entry[0].id)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._sessions_by_user[entry[0].id]
+        return True
@@ -20,9 +20,12 @@ def stats() -> str:
     Return:
       - the number of each objects
     """
+    from api.v1.app import auth
     from models.user import User
     stats = {}
     stats['users'] = User.count()
+    if auth is not None and auth.metrics():
+        stats['auth'] = auth.metrics()
     return jsonify(stats)
 
 
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" Startup time of User.load_from_file: kwargs constructor with
+strptime (previous path) vs Base.from_json with fromisoformat
+
+Run from the project directory:
+    python3 -m benchmarks.load_from_file [users ...]
+"""
+from datetime import datetime, timedelta
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+def write_users(count: int):
+    """ Writes .db_User.json with count users in the current directory,
+    created one second apart and never updated
+    """
+    start = datetime.utcnow() - timedelta(seconds=count)
+    objs_json = {}
+    for i in range(count):
+        obj_id = "{:032x}".format(i)
+        created_at = (start + timedelta(seconds=i)).strftime(
+            "%Y-%m-%dT%H:%M:%S")
+        objs_json[obj_id] = {
+            'id': obj_id,
+            'created_at': created_at, 'updated_at': created_at,
+            'email': "user{}@example.com".format(i),
+            '_password': "{:064x}".format(i),
+            'first_name': "First{}".format(i),
+            'last_name': "Last{}".format(i),
+        }
+    with open(".db_User.json", "w") as f:
+        json.dump(objs_json, f)
+
+
+def legacy_build(cls, obj_json: dict):
+    """ Previous Base.__init__: kwargs constructor and strptime """
+    from models.base import TIMESTAMP_FORMAT
+    obj = cls(**dict(obj_json, created_at=None, updated_at=None))
+    obj.created_at = datetime.strptime(obj_json['created_at'],
+                                       TIMESTAMP_FORMAT)
+    obj.updated_at = datetime.strptime(obj_json['updated_at'],
+                                       TIMESTAMP_FORMAT)
+    return obj
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    directory = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(directory)
+    sys.path.insert(0, cwd)
+    from models.user import User
+
+    for count in counts:
+        write_users(count)
+
+        start = time.perf_counter()
+        with open(".db_User.json") as f:
+            objs_json = json.load(f)
+        parsed = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy = {obj_id: legacy_build(User, obj_json)
+                  for obj_id, obj_json in objs_json.items()}
+        legacy_time = time.perf_counter() - start
+        del legacy
+        start = time.perf_counter()
+        fast = {obj_id: User.from_json(obj_json)
+                for obj_id, obj_json in objs_json.items()}
+        fast_time = time.perf_counter() - start
+        del fast, objs_json
+
+        start = time.perf_counter()
+        User.load_from_file()
+        load_time = time.perf_counter() - start
+        assert User.count() == count
+
+        print("{} users (json.load {:.2f} s)".format(count, parsed))
+        print("  build, kwargs + strptime:  {:8.2f} s".format(legacy_time))
+        print("  build, from_json:          {:8.2f} s  x{:.1f}"
+              .format(fast_time, legacy_time / fast_time))
+        print("  load_from_file, previous:  {:8.2f} s (estimated)"
+              .format(load_time - fast_time + legacy_time))
+        print("  load_from_file:            {:8.2f} s".format(load_time))
+
+    os.chdir(cwd)
+    shutil.rmtree(directory)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+""" Micro-benchmark of Auth.require_auth with 1k exclusion rules
+
+Run from the project directory:
+    python3 -m benchmarks.require_auth
+"""
+from api.v1.auth.auth import Auth
+from timeit import timeit
+
+
+def legacy_require_auth(path, excluded_paths):
+    """ Previous implementation: loop over every excluded path """
+    if path is None or excluded_paths is None or excluded_paths == []:
+        return True
+    l_path = len(path)
+    if l_path == 0:
+        return True
+    tmp_path = path if path[l_path - 1] == '/' else path + '/'
+    for exc in excluded_paths:
+        l_exc = len(exc)
+        if l_exc == 0:
+            continue
+        if exc[l_exc - 1] != '*':
+            if tmp_path == exc:
+                return False
+        elif exc[:-1] == path[:l_exc - 1]:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    rules = 1000
+    excluded = tuple(['/api/v1/public/{}/'.format(i)
+                      for i in range(rules // 2)] +
+                     ['/api/v1/static/{}*'.format(i)
+                      for i in range(rules // 2)])
+    paths = ['/api/v1/users/me', '/api/v1/public/499',
+             '/api/v1/static/499/app.js', '/api/v1/status']
+    auth = Auth()
+    number = 2000
+
+    for path in paths:
+        assert auth.require_auth(path, excluded) == \
+            legacy_require_auth(path, list(excluded))
+
+    for name, func, arg in (
+            ("legacy", legacy_require_auth, list(excluded)),
+            ("compiled", auth.require_auth, excluded)):
+        seconds = timeit(lambda: [func(p, arg) for p in paths],
+                         number=number)
+        print("{:>8}: {:8.2f} us/lookup ({} rules)".format(
+            name, seconds / (number * len(paths)) * 1e6, rules))
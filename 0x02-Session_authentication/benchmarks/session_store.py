@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" Bytes per session: legacy dict of dicts vs SessionStore
+
+Run from the project directory:
+    python3 -m benchmarks.session_store [sessions]
+"""
+from api.v1.auth.session_store import SessionStore
+from datetime import datetime
+import sys
+import time
+import tracemalloc
+import uuid
+
+
+def measure(fill, count):
+    """ Returns the bytes allocated by fill(count) per session """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = fill(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return (after - before) / count
+
+
+def legacy(count):
+    """ Previous SessionExpAuth layout """
+    sessions = {}
+    for i in range(count):
+        sessions[str(uuid.uuid4())] = {
+            "user_id": str(uuid.uuid4()),
+            "created_at": datetime.now()
+        }
+    return sessions
+
+
+def compact(count):
+    """ SessionStore layout """
+    store = SessionStore()
+    expires_at = int(time.time()) + 3600
+    for i in range(count):
+        store.set(str(uuid.uuid4()), str(uuid.uuid4()), expires_at)
+    return store
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    legacy_bytes = measure(legacy, count)
+    compact_bytes = measure(compact, count)
+    print("{} sessions".format(count))
+    print("  legacy: {:7.1f} bytes/session".format(legacy_bytes))
+    print(" compact: {:7.1f} bytes/session".format(compact_bytes))
+    print("   saved: {:7.1f}%".format(
+        100 * (legacy_bytes - compact_bytes) / legacy_bytes))
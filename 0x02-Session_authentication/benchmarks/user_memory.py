@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" Bytes per user: __dict__ objects with one datetime per timestamp
+(previous layout) vs __slots__ objects with shared timestamps
+
+Run from the project directory:
+    python3 -m benchmarks.user_memory [users]
+"""
+from benchmarks.load_from_file import write_users
+from datetime import datetime
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+
+class LegacyUser:
+    """ Previous layout of a loaded User """
+
+    def __init__(self, obj_json: dict):
+        self.id = obj_json['id']
+        self.created_at = datetime.fromisoformat(obj_json['created_at'])
+        self.updated_at = datetime.fromisoformat(obj_json['updated_at'])
+        self.email = obj_json['email']
+        self._password = obj_json['_password']
+        self.first_name = obj_json['first_name']
+        self.last_name = obj_json['last_name']
+
+
+def measure(build, objs_json: dict) -> float:
+    """ Returns the bytes allocated per object by build(obj_json),
+    strings excluded (they are shared with objs_json)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = {obj_id: build(obj_json) for obj_id, obj_json in objs_json.items()}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return (after - before) / len(objs_json)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    directory = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(directory)
+    sys.path.insert(0, cwd)
+    from models.user import User
+
+    write_users(count)
+    with open(".db_User.json") as f:
+        objs_json = json.load(f)
+    legacy = measure(LegacyUser, objs_json)
+    slots = measure(User.from_json, objs_json)
+    del objs_json
+
+    gc.collect()
+    tracemalloc.start()
+    User.load_from_file()
+    loaded = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("{} users, bytes per user".format(count))
+    print("  __dict__ + datetimes:          {:6.0f}".format(legacy))
+    print("  __slots__ + shared timestamps: {:6.0f}  -{:.0f}%"
+          .format(slots, 100 * (legacy - slots) / legacy))
+    print("  load_from_file, all included:  {:6.0f}"
+          .format(loaded / count))
+    os.chdir(cwd)
+    shutil.rmtree(directory)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" GET /api/v1/users with 50k users: previous serialization (generic
+to_json with strftime, json.dumps per user, pretty printed jsonify)
+vs per-class serializer, cached timestamps and chunked encoding
+
+Run from the project directory:
+    python3 -m benchmarks.users_endpoint [users]
+"""
+from benchmarks.load_from_file import write_users
+from datetime import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+def legacy_to_json(obj) -> dict:
+    """ Previous Base.to_json """
+    result = {}
+    for key in obj.fields():
+        value = getattr(obj, key)
+        if key[0] == '_':
+            continue
+        if type(value) is datetime:
+            result[key] = value.strftime("%Y-%m-%dT%H:%M:%S")
+        else:
+            result[key] = value
+    return result
+
+
+def legacy_stream(users):
+    """ Previous streamed body: json.dumps per user """
+    yield "["
+    separator = ""
+    for user in users:
+        yield separator + json.dumps(legacy_to_json(user))
+        separator = ","
+    yield "]\n"
+
+
+def best(function, runs: int = 3) -> float:
+    """ Returns the best time of runs calls, in seconds """
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    directory = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(directory)
+    sys.path.insert(0, cwd)
+    os.environ.pop("AUTH_TYPE", None)
+    write_users(count)
+
+    from api.v1.app import app
+    from api.v1 import json_encoder
+    from api.v1.views.users import _json_array
+    from flask import jsonify
+    from models.user import User
+    User.load_from_file()
+    users = list(User.iterate())
+
+    with app.app_context():
+        app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+        if hasattr(app, 'json'):
+            app.json.compact = False
+        pretty = best(lambda: jsonify([legacy_to_json(u) for u in users]))
+    legacy = best(lambda: "".join(legacy_stream(users)))
+    body = best(lambda: b"".join(_json_array(users)))
+    client = app.test_client()
+    response = client.get('/api/v1/users')
+    assert len(json.loads(response.data)) == count
+    endpoint = best(lambda: client.get('/api/v1/users').data)
+
+    print("{} users, {} encoder".format(count, json_encoder.ENCODER))
+    print("  pretty printed jsonify:    {:7.1f} ms".format(pretty * 1000))
+    print("  previous streamed body:    {:7.1f} ms".format(legacy * 1000))
+    print("  streamed body:             {:7.1f} ms  x{:.1f}"
+          .format(body * 1000, legacy / body))
+    print("  GET /api/v1/users:         {:7.1f} ms".format(endpoint * 1000))
+    os.chdir(cwd)
+    shutil.rmtree(directory)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+""" Journal module
+"""
+from typing import Callable
+import atexit
+import json
+import os
+import threading
+import time
+
+
+FSYNC_POLICIES = ('always', 'batched', 'never')
+
+
+class Journal():
+    """ Append-only log of the save/remove operations of one model class,
+    compacted in the background into the `.db_<Class>.json` snapshot
+
+    With fsync 'batched', appends not fsynced right away are fsynced by
+    a timer at most fsync_interval seconds later
+    """
+
+    def __init__(self, s_class: str, fsync: str = 'batched',
+                 compact_every: int = 1000, fsync_interval: float = 1.0):
+        """ Initialize a Journal instance
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError("fsync must be one of {}".format(FSYNC_POLICIES))
+        self.snapshot_path = ".db_{}.json".format(s_class)
+        self.log_path = ".db_{}.log".format(s_class)
+        self.compacting_path = "{}.compacting".format(self.log_path)
+        self.fsync = fsync
+        self.compact_every = compact_every
+        self.fsync_interval = fsync_interval
+        self.entries = 0
+        self._lock = threading.RLock()
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._fsync_timer = None
+        self._compactor = None
+        self._compact_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def append(self, op: str, obj_id: str, obj_json: dict = None):
+        """ Append one operation ('save' or 'remove') to the log
+        """
+        entry = {'op': op, 'id': obj_id}
+        if obj_json is not None:
+            entry['obj'] = obj_json
+        line = json.dumps(entry) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.log_path, 'a')
+            self._file.write(line)
+            self._file.flush()
+            now = time.monotonic()
+            if self.fsync == 'always' or (self.fsync == 'batched' and
+                                          now - self._last_fsync >=
+                                          self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+            elif self.fsync == 'batched' and self._fsync_timer is None:
+                delay = self._last_fsync + self.fsync_interval - now
+                self._fsync_timer = threading.Timer(max(delay, 0),
+                                                    self._fsync_pending)
+                self._fsync_timer.daemon = True
+                self._fsync_timer.start()
+            self.entries += 1
+
+    def _fsync_pending(self):
+        """ Timer callback: fsync the appends of the last interval
+        """
+        with self._lock:
+            self._fsync_timer = None
+            if self._file is None:
+                return
+            os.fsync(self._file.fileno())
+            self._last_fsync = time.monotonic()
+
+    def replay(self) -> dict:
+        """ Return all objects JSON by ID: snapshot + replayed logs
+        """
+        with self._lock:
+            objs_json = {}
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r') as f:
+                    objs_json = json.load(f)
+
+            self.entries = 0
+            for log_path in (self.compacting_path, self.log_path):
+                if not os.path.exists(log_path):
+                    continue
+                with open(log_path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if entry.get('op') == 'remove':
+                            objs_json.pop(entry.get('id'), None)
+                        else:
+                            objs_json[entry.get('id')] = entry.get('obj')
+                        if log_path == self.log_path:
+                            self.entries += 1
+            return objs_json
+
+    def signature(self) -> tuple:
+        """ Return the (inode, mtime, size) of the snapshot and logs
+        """
+        result = []
+        for file_path in (self.snapshot_path, self.compacting_path,
+                          self.log_path):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                result.append(None)
+                continue
+            result.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(result)
+
+    def needs_compaction(self) -> bool:
+        """ True if the log is long enough to be compacted
+        """
+        return self.entries >= self.compact_every and \
+            (self._compactor is None or not self._compactor.is_alive())
+
+    def compact(self, dump: Callable[[], dict],
+                on_done: Callable[[], None] = None):
+        """ Write a new snapshot with dump() and discard the logs
+        dump is called while appends are blocked; compactions run one
+        at a time (a synchronous one waits for a background one).
+        The snapshot swap and the compacting log removal happen under
+        the lock, so a replay sees either both old or both new files;
+        on_done is called once they are done, still under the lock
+        """
+        with self._compact_lock:
+            with self._lock:
+                self._rotate()
+                objs_json = dump()
+
+            tmp_path = "{}.tmp".format(self.snapshot_path)
+            with open(tmp_path, 'w') as f:
+                json.dump(objs_json, f)
+                f.flush()
+                if self.fsync != 'never':
+                    os.fsync(f.fileno())
+            with self._lock:
+                os.replace(tmp_path, self.snapshot_path)
+                os.remove(self.compacting_path)
+                if on_done is not None:
+                    on_done()
+
+    def compact_in_background(self, dump: Callable[[], dict],
+                              on_done: Callable[[], None] = None):
+        """ Start compact(dump, on_done) in a daemon thread
+        """
+        with self._lock:
+            if not self.needs_compaction():
+                return
+            self._compactor = threading.Thread(target=self.compact,
+                                               args=(dump, on_done),
+                                               daemon=True)
+            self._compactor.start()
+
+    def close(self):
+        """ Flush and close the log
+        """
+        with self._lock:
+            if self._fsync_timer is not None:
+                self._fsync_timer.cancel()
+                self._fsync_timer = None
+            if self._file is None:
+                return
+            self._file.flush()
+            if self.fsync != 'never':
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _rotate(self):
+        """ Move the current log aside, appending to a compacting log
+        left by an interrupted compaction
+        """
+        self.close()
+        self.entries = 0
+        if not os.path.exists(self.log_path):
+            open(self.compacting_path, 'a').close()
+            return
+        if not os.path.exists(self.compacting_path):
+            os.replace(self.log_path, self.compacting_path)
+            return
+        with open(self.log_path, 'r') as src, \
+                open(self.compacting_path, 'a') as dst:
+            dst.write(src.read())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.remove(self.log_path)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+""" Persistence scheduler module
+"""
+from concurrent.futures import Future
+from typing import Callable
+import atexit
+import json
+import os
+import threading
+import time
+
+
+class PersistenceScheduler():
+    """ Group commit of one `.db_<Class>.json` file: all saves/removes
+    pending during a write (or a short window) are committed together
+    by a single atomic write (temp file + rename)
+    """
+
+    def __init__(self, file_path: str, dump: Callable[[], dict],
+                 on_written: Callable[[], None] = None,
+                 window: float = 0.0, max_batch: int = 64):
+        """ Initialize a PersistenceScheduler instance
+        """
+        self.file_path = file_path
+        self.dump = dump
+        self.on_written = on_written
+        self.window = window
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._thread = None
+        atexit.register(self.flush)
+
+    def submit(self) -> Future:
+        """ Schedule a write of the file
+        Return a future resolved once the change is on disk
+        """
+        future = Future()
+        with self._cond:
+            self._pending.append(future)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def flush(self):
+        """ Wait until every pending change is on disk
+        """
+        with self._cond:
+            if len(self._pending) == 0:
+                return
+        self.submit().result()
+
+    def write(self):
+        """ Write all objects to the file atomically
+        """
+        with self._write_lock:
+            objs_json = self.dump()
+            tmp_path = "{}.{}.tmp".format(self.file_path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump(objs_json, f)
+            os.replace(tmp_path, self.file_path)
+            if self.on_written is not None:
+                self.on_written()
+
+    def _run(self):
+        """ Writer loop: wait for a batch then commit it
+        """
+        while True:
+            with self._cond:
+                while len(self._pending) == 0:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+
+            try:
+                self.write()
+            except Exception as e:
+                for future in batch:
+                    future.set_exception(e)
+            else:
+                for future in batch:
+                    future.set_result(None)
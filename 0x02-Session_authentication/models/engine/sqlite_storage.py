@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+""" SQLite storage module
+"""
+from concurrent.futures import Future
+from models.engine.storage import Storage, done, matches
+from typing import TypeVar, List, Iterator
+import json
+import sqlite3
+import threading
+
+
+class SQLiteStorage(Storage):
+    """ Objects stored in one SQLite database shared by all processes
+
+    Each class has its own table: `id`, the JSON of the object in `data`
+    and one indexed column per attribute declared in `INDEXES`
+    """
+
+    def __init__(self, db_path: str = ".db.sqlite3", timeout: float = 30):
+        """ Initialize a SQLiteStorage instance
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables = set()
+
+    def save(self, obj: TypeVar('Base')) -> Future:
+        """ Insert or update one object
+        """
+        cls = obj.__class__
+        table = self._table(cls)
+        attrs = list(cls.INDEXES)
+        columns = ''.join(', "{}"'.format(attr) for attr in attrs)
+        updates = ''.join(', "{0}" = excluded."{0}"'.format(attr)
+                          for attr in attrs)
+        params = [obj.id, json.dumps(obj.to_json(True))]
+        params += [getattr(obj, attr, None) for attr in attrs]
+        query = 'INSERT INTO "{}" (id, data{}) VALUES (?, ?{}) ' \
+                'ON CONFLICT(id) DO UPDATE SET data = excluded.data{}' \
+                .format(table, columns, ', ?' * len(attrs), updates)
+        try:
+            self._connection().execute(query, params)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(str(e))
+        return done()
+
+    def remove(self, obj: TypeVar('Base')) -> Future:
+        """ Delete one object
+        """
+        table = self._table(obj.__class__)
+        self._connection().execute(
+            'DELETE FROM "{}" WHERE id = ?'.format(table), (obj.id,))
+        return done()
+
+    def count(self, cls: type) -> int:
+        """ Count all objects
+        """
+        table = self._table(cls)
+        cursor = self._connection().execute(
+            'SELECT COUNT(*) FROM "{}"'.format(table))
+        return cursor.fetchone()[0]
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object by ID
+        """
+        table = self._table(cls)
+        cursor = self._connection().execute(
+            'SELECT data FROM "{}" WHERE id = ?'.format(table), (id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return cls.from_json(json.loads(row[0]))
+
+    def iterate(self, cls: type, after: str = None,
+                chunk: int = 1000) -> Iterator[TypeVar('Base')]:
+        """ Yield the objects ordered by ID, starting after the ID
+        `after`, reading the primary key index chunk by chunk
+        """
+        table = self._table(cls)
+        query = 'SELECT id, data FROM "{}" WHERE id > ? ' \
+                'ORDER BY id LIMIT ?'.format(table)
+        after = '' if after is None else after
+        while True:
+            rows = self._connection().execute(query,
+                                              (after, chunk)).fetchall()
+            if len(rows) == 0:
+                return
+            for _, data in rows:
+                yield cls.from_json(json.loads(data))
+            after = rows[-1][0]
+
+    def search(self, cls: type,
+               attributes: dict = {}) -> List[TypeVar('Base')]:
+        """ Search all objects with matching attributes: indexed
+        attributes are filtered by SQLite, the others in Python
+        """
+        query, params = self._query(cls, attributes)
+        cursor = self._connection().execute(query, params)
+        result = []
+        for row in cursor:
+            obj = cls.from_json(json.loads(row[0]))
+            if matches(obj, attributes):
+                result.append(obj)
+        return result
+
+    def explain(self, cls: type, attributes: dict = {}) -> dict:
+        """ Describe a search with SQLite EXPLAIN QUERY PLAN
+        """
+        query, params = self._query(cls, attributes)
+        cursor = self._connection().execute(
+            "EXPLAIN QUERY PLAN {}".format(query), params)
+        plan = [row[-1] for row in cursor]
+        index = None
+        for attr in cls.INDEXES:
+            if attr in attributes and any(
+                    '{}_{}'.format(cls.__name__, attr) in step
+                    for step in plan):
+                index = attr
+        return {'class': cls.__name__, 'index': index, 'plan': plan}
+
+    def _query(self, cls: type, attributes: dict) -> tuple:
+        """ Return the SELECT query and parameters of a search
+        """
+        table = self._table(cls)
+        where = []
+        params = []
+        for attr, value in attributes.items():
+            if attr not in cls.INDEXES:
+                continue
+            if value is None:
+                where.append('"{}" IS NULL'.format(attr))
+            else:
+                where.append('"{}" = ?'.format(attr))
+                params.append(value)
+        query = 'SELECT data FROM "{}"'.format(table)
+        if len(where) > 0:
+            query += ' WHERE {}'.format(' AND '.join(where))
+        return query + ' ORDER BY rowid', params
+
+    def _connection(self) -> sqlite3.Connection:
+        """ Return the connection of the current thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _table(self, cls: type) -> str:
+        """ Create (or migrate) the table of a class on first use
+        Return the table name
+        """
+        table = cls.__name__
+        if table in self._tables:
+            return table
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute('CREATE TABLE IF NOT EXISTS "{}" '
+                         '(id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+                         .format(table))
+            cursor = conn.execute('PRAGMA table_info("{}")'.format(table))
+            columns = [row[1] for row in cursor]
+            for attr, options in cls.INDEXES.items():
+                if attr not in columns:
+                    conn.execute('ALTER TABLE "{}" ADD COLUMN "{}"'
+                                 .format(table, attr))
+                    conn.execute('UPDATE "{0}" SET "{1}" = '
+                                 'json_extract(data, \'$.{1}\')'
+                                 .format(table, attr))
+                unique = 'UNIQUE ' if options.get('unique', False) else ''
+                conn.execute('CREATE {}INDEX IF NOT EXISTS "{}_{}" '
+                             'ON "{}" ("{}")'
+                             .format(unique, table, attr, table, attr))
+            self._tables.add(table)
+        return table
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+""" Storage module
+"""
+from concurrent.futures import Future
+from typing import TypeVar, List, Iterable, Iterator
+
+
+class Storage():
+    """ Interface of the storage engines behind Base
+    Every method receives the model class (or object) it applies to
+    """
+
+    def load(self, cls: type):
+        """ Load all objects of a class from the persistent store
+        """
+        pass
+
+    def save_all(self, cls: type):
+        """ Write all objects of a class to the persistent store
+        """
+        pass
+
+    def reload(self, cls: type, force: bool = False) -> bool:
+        """ Reload the objects of a class if the store changed
+        Return True if objects have been reloaded
+        """
+        return False
+
+    def invalidate(self, cls: type):
+        """ Force the next reload to read the persistent store
+        """
+        pass
+
+    def save(self, obj: TypeVar('Base')) -> Future:
+        """ Save one object
+        Return a future resolved once the object is persisted
+        """
+        raise NotImplementedError
+
+    def remove(self, obj: TypeVar('Base')) -> Future:
+        """ Remove one object
+        Return a future resolved once the removal is persisted
+        """
+        raise NotImplementedError
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        raise NotImplementedError
+
+    def all(self, cls: type) -> Iterable[TypeVar('Base')]:
+        """ Return all objects of a class
+        """
+        return self.search(cls)
+
+    def iterate(self, cls: type,
+                after: str = None) -> Iterator[TypeVar('Base')]:
+        """ Yield the objects of a class ordered by ID,
+        starting after the ID `after`
+        """
+        for obj in sorted(self.all(cls), key=lambda obj: obj.id):
+            if after is None or obj.id > after:
+                yield obj
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object by ID
+        """
+        raise NotImplementedError
+
+    def search(self, cls: type,
+               attributes: dict = {}) -> List[TypeVar('Base')]:
+        """ Search all objects of a class with matching attributes
+        """
+        raise NotImplementedError
+
+    def explain(self, cls: type, attributes: dict = {}) -> dict:
+        """ Describe how search() answers a query
+        """
+        return {'class': cls.__name__, 'index': None}
+
+
+def done() -> Future:
+    """ Return an already resolved future
+    """
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+def matches(obj: TypeVar('Base'), attributes: dict) -> bool:
+    """ True if all attributes of obj are equal to the given values
+    """
+    for k, v in attributes.items():
+        if (getattr(obj, k) != v):
+            return False
+    return True
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """API Routes for Authentication Service"""
-from auth import Auth
+from auth import Auth, HashingBusy
 from flask import (Flask,
                    jsonify,
                    request,
@@ -11,6 +11,20 @@ app = Flask(__name__)
 AUTH = Auth()
 
 
+@app.teardown_appcontext
+def close_db_session(exception=None) -> None:
+    """ Returns the request's database session to the pool """
+    AUTH.close_session()
+
+
+@app.errorhandler(HashingBusy)
+def hashing_busy(error) -> str:
+    """ Password hashing queue saturated: ask the client to retry """
+    response = jsonify({"message": "service busy"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 @app.route('/', methods=['GET'])
 def hello_world() -> str:
     """ Base route for authentication service API """
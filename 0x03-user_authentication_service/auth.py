@@ -2,25 +2,85 @@
 """ Authentication Module """
 
 import bcrypt
+from concurrent.futures import Future, ThreadPoolExecutor
 from db import DB
+from os import cpu_count, getenv
 from sqlalchemy.orm.exc import NoResultFound
-from typing import Union
+from typing import Callable, Union
 from user import User
 from uuid import uuid4
+import threading
 
 
-def _hash_password(password: str) -> str:
-    """ Returns a salted hash of the input password """
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+BCRYPT_ROUNDS = int(getenv("AUTH_BCRYPT_ROUNDS", 12))
+
+
+def _hash_password(password: str, rounds: int = None) -> bytes:
+    """ Returns a salted hash of the input password, with a cost factor
+    of rounds (default AUTH_BCRYPT_ROUNDS)
+    """
+    if rounds is None:
+        rounds = BCRYPT_ROUNDS
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds))
     return hashed
 
 
+def _hash_rounds(hashed_password: Union[bytes, str]) -> Union[int, None]:
+    """ Returns the cost factor of a bcrypt hash ($2b$<cost>$...) """
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode()
+    try:
+        return int(hashed_password.split(b'$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
 def _generate_uuid() -> str:
     """Returns a string representation of a new UUID"""
     UUID = uuid4()
     return str(UUID)
 
 
+class HashingBusy(Exception):
+    """Raised when the bcrypt hashing queue is full"""
+
+
+class HashingPool:
+    """Dedicated executor for bcrypt hashing and verification
+
+    bcrypt releases the GIL, so a thread pool spreads the work across
+    cores. At most `workers + max_pending` calls are admitted at once;
+    beyond that, submit() raises HashingBusy instead of queueing.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        """Creates the pool"""
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedules fn(*args), raises HashingBusy if saturated"""
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args):
+        """Runs fn(*args) in the pool and returns its result"""
+        return self.submit(fn, *args).result()
+
+
+HASH_WORKERS = int(getenv("AUTH_HASH_WORKERS", cpu_count() or 1))
+HASHING_POOL = HashingPool(HASH_WORKERS,
+                           int(getenv("AUTH_HASH_QUEUE", 4 * HASH_WORKERS)))
+
+
 class Auth:
     """Auth class to interact with the authentication database.
     """
@@ -28,15 +88,21 @@ class Auth:
     def __init__(self):
         self._db = DB()
 
+    def close_session(self) -> None:
+        """Releases the database session of the current thread"""
+        self._db.remove_session()
+
     def register_user(self, email: str, password: str) -> User:
         """ Registers a user in the database
         Returns: User Object
+        Raises ValueError if the email is already registered, including
+        by a concurrent registration that committed first
         """
 
         try:
             user = self._db.find_user_by(email=email)
         except NoResultFound:
-            hashed_password = _hash_password(password)
+            hashed_password = HASHING_POOL.run(_hash_password, password)
             user = self._db.add_user(email, hashed_password)
 
             return user
@@ -45,7 +111,10 @@ class Auth:
             raise ValueError(f'User {email} already exists')
 
     def valid_login(self, email: str, password: str) -> bool:
-        """If password is valid returns true, else, false"""
+        """If password is valid returns true, else, false
+        A valid password hashed with another cost factor than
+        AUTH_BCRYPT_ROUNDS is rehashed in place
+        """
         try:
             user = self._db.find_user_by(email=email)
         except NoResultFound:
@@ -54,10 +123,18 @@ class Auth:
         user_password = user.hashed_password
         encoded_password = password.encode()
 
-        if bcrypt.checkpw(encoded_password, user_password):
-            return True
+        if not HASHING_POOL.run(bcrypt.checkpw, encoded_password,
+                                user_password):
+            return False
+
+        if _hash_rounds(user_password) != BCRYPT_ROUNDS:
+            try:
+                hashed_password = HASHING_POOL.run(_hash_password, password)
+            except HashingBusy:
+                return True
+            self._db.update_user(user.id, hashed_password=hashed_password)
 
-        return False
+        return True
 
     def create_session(self, email: str) -> str:
         """ Returns session ID for a user """
@@ -120,7 +197,7 @@ class Auth:
         except NoResultFound:
             raise ValueError
 
-        hashed_password = _hash_password(password)
+        hashed_password = HASHING_POOL.run(_hash_password, password)
         self._db.update_user(user.id,
                              hashed_password=hashed_password,
                              reset_token=None)
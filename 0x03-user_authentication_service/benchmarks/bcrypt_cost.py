@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+""" Calibrates the bcrypt cost factor: the largest AUTH_BCRYPT_ROUNDS
+whose hashing time stays under a target latency on this machine
+
+Run from the project directory:
+    python3 -m benchmarks.bcrypt_cost [target_ms]
+"""
+import bcrypt
+import sys
+import time
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+def hash_time(rounds: int, samples: int = 3) -> float:
+    """ Returns the best of samples hashing times, in seconds """
+    salt = bcrypt.gensalt(rounds)
+    best = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration password", salt)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def calibrate(target_ms: float) -> int:
+    """ Returns the largest cost factor hashing in under target_ms
+    (at least MIN_ROUNDS). Each round doubles the work, so the search
+    stops as soon as the next round is predicted to exceed the target
+    """
+    rounds = MIN_ROUNDS
+    elapsed = hash_time(rounds)
+    print("  rounds {:2d}: {:9.1f} ms".format(rounds, elapsed * 1000))
+    while rounds < MAX_ROUNDS and elapsed * 2 * 1000 <= target_ms:
+        samples = 3 if elapsed < 0.1 else 1
+        next_elapsed = hash_time(rounds + 1, samples)
+        print("  rounds {:2d}: {:9.1f} ms".format(rounds + 1,
+                                                  next_elapsed * 1000))
+        if next_elapsed * 1000 > target_ms:
+            break
+        rounds, elapsed = rounds + 1, next_elapsed
+    return rounds
+
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250
+    print("target {:.0f} ms per hash".format(target))
+    print("AUTH_BCRYPT_ROUNDS={}".format(calibrate(target)))
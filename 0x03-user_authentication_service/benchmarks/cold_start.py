@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+""" Startup time of DB: persistent open vs drop_all/create_all reset
+
+Run from the project directory:
+    python3 -m benchmarks.cold_start [users]
+"""
+from benchmarks.find_user_by import fill
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+def startup(reset: bool) -> float:
+    """ Returns the seconds taken by DB(reset) and a first query """
+    from db import DB
+    from user import User
+
+    start = time.perf_counter()
+    db = DB(reset=reset)
+    db._session.query(User).first()
+    elapsed = time.perf_counter() - start
+    db.remove_session()
+    db._engine.dispose()
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    directory = tempfile.mkdtemp()
+    os.environ["AUTH_DB_URL"] = "sqlite:///{}".format(
+        os.path.join(directory, "bench.db"))
+    from db import DB
+
+    db = DB(reset=True)
+    fill(db, count)
+    db._engine.dispose()
+
+    persistent = min(startup(False) for _ in range(5))
+    reset = startup(True)
+
+    print("{} users".format(count))
+    print("  reset (drop_all + create_all): {:8.1f} ms".format(reset * 1000))
+    print("  persistent (schema check):     {:8.1f} ms"
+          .format(persistent * 1000))
+    shutil.rmtree(directory)
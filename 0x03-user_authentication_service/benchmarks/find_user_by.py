@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+""" Lookup latency of DB.find_user_by with and without the indexes
+
+Run from the project directory:
+    python3 -m benchmarks.find_user_by [users]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+
+def fill(db, count, batch=50000):
+    """ Inserts count users in bulk """
+    from user import User
+    with db._engine.begin() as conn:
+        for start in range(0, count, batch):
+            conn.execute(User.__table__.insert(), [
+                {"email": "user{}@example.com".format(i),
+                 "hashed_password": "x",
+                 "session_id": "session-{}".format(i),
+                 "reset_token": "token-{}".format(i)}
+                for i in range(start, min(start + batch, count))])
+
+
+def lookups(db, count, rounds=200):
+    """ Returns the mean latency (ms) of find_user_by per column """
+    result = {}
+    rnd = random.Random(0)
+    for column, value in (("email", "user{}@example.com"),
+                          ("session_id", "session-{}"),
+                          ("reset_token", "token-{}")):
+        start = time.perf_counter()
+        for i in range(rounds):
+            db.find_user_by(**{column: value.format(
+                rnd.randrange(count))})
+            db.remove_session()
+        result[column] = (time.perf_counter() - start) / rounds * 1000
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.db")
+    os.environ["AUTH_DB_URL"] = "sqlite:///{}".format(path)
+    from db import DB
+
+    db = DB()
+    fill(db, count)
+    indexed = lookups(db, count)
+
+    with db._engine.begin() as conn:
+        for index in ("ix_users_email", "ix_users_session_id",
+                      "ix_users_reset_token"):
+            conn.exec_driver_sql("DROP INDEX {}".format(index))
+    scanned = lookups(db, count, rounds=5)
+
+    print("{} users".format(count))
+    for column in indexed:
+        print("{:>12}: {:9.3f} ms without index, {:7.3f} ms with index"
+              .format(column, scanned[column], indexed[column]))
+
+    db._engine.dispose()
+    shutil.rmtree(directory)
@@ -1,39 +1,120 @@
 #!/usr/bin/env python3
 """ Database for ORM """
-from sqlalchemy import create_engine
+from os import getenv
+from sqlalchemy import (Column, Integer, Table, create_engine, event,
+                        inspect, select)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.pool import QueuePool, StaticPool
 from typing import TypeVar
 from user import Base, User
 
 
+SCHEMA_VERSION = 2
+schema_version = Table("schema_version", Base.metadata,
+                       Column("version", Integer, nullable=False))
+
+
 class DB:
-    """ DB Class for Object Reational Mapping """
+    """ DB Class for Object Reational Mapping
+
+    Configuration (environment):
+        AUTH_DB_URL: database URL (default sqlite:///a.db); an
+            in-memory SQLite database is one connection shared by all
+            threads
+        AUTH_DB_POOL_SIZE: connections kept in the pool (default 5)
+        AUTH_DB_MAX_OVERFLOW: extra connections under load (default 10)
+        AUTH_DB_BUSY_TIMEOUT: SQLite busy timeout in ms (default 5000)
+        AUTH_DB_RESET: 1 to drop and recreate all tables at startup
+    """
+
+    def __init__(self, reset: bool = None):
+        """ Constructor Method
+        reset: drop and recreate all tables (for tests), otherwise open
+        the existing database and only create what its schema lacks
+        """
+        if reset is None:
+            reset = getenv("AUTH_DB_RESET", "0") == "1"
+        url = getenv("AUTH_DB_URL", "sqlite:///a.db")
+        options = {"echo": False}
+        if url.startswith("sqlite") and (":memory:" in url or
+                                         url == "sqlite://"):
+            options["poolclass"] = StaticPool
+            options["connect_args"] = {"check_same_thread": False}
+        else:
+            options["pool_size"] = int(getenv("AUTH_DB_POOL_SIZE", 5))
+            options["max_overflow"] = int(getenv("AUTH_DB_MAX_OVERFLOW", 10))
+            if url.startswith("sqlite"):
+                options["poolclass"] = QueuePool
+                options["connect_args"] = {"check_same_thread": False}
+        self._engine = create_engine(url, **options)
+        if url.startswith("sqlite"):
+            busy_timeout = int(getenv("AUTH_DB_BUSY_TIMEOUT", 5000))
+            event.listen(self._engine, "connect",
+                         lambda conn, record: _sqlite_pragmas(conn,
+                                                              busy_timeout))
+        if reset:
+            Base.metadata.drop_all(self._engine)
+        self._migrate()
+        self.__session = scoped_session(sessionmaker(bind=self._engine,
+                                                     expire_on_commit=False))
+
+    def _migrate(self) -> None:
+        """ Brings the database to SCHEMA_VERSION: nothing to do if it is
+        current, otherwise creates the missing tables and the indexes
+        missing from existing tables (create_all skips existing tables)
+        """
+        version = self._schema_version()
+        if version == SCHEMA_VERSION:
+            return
+        if version is not None and version > SCHEMA_VERSION:
+            raise RuntimeError("database schema version {} is newer than {}"
+                               .format(version, SCHEMA_VERSION))
 
-    def __init__(self):
-        """ Constructor Method """
-        self._engine = create_engine("sqlite:///a.db", echo=False)
-        Base.metadata.drop_all(self._engine)
         Base.metadata.create_all(self._engine)
-        self.__session = None
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self._engine, checkfirst=True)
+
+        with self._engine.begin() as conn:
+            conn.execute(schema_version.delete())
+            conn.execute(schema_version.insert().values(
+                version=SCHEMA_VERSION))
+
+    def _schema_version(self) -> int:
+        """ Returns the schema version of the database, None if unknown
+        """
+        if not inspect(self._engine).has_table(schema_version.name):
+            return None
+        with self._engine.connect() as conn:
+            return conn.execute(select(schema_version.c.version)).scalar()
 
     @property
     def _session(self):
-        """ Session Getter Method """
-        if self.__session is None:
-            DBSession = sessionmaker(bind=self._engine)
-            self.__session = DBSession()
-        return self.__session
+        """ Session Getter Method: one session per thread """
+        return self.__session()
+
+    def remove_session(self) -> None:
+        """ Closes the session of the current thread and returns its
+        connection to the pool
+        """
+        self.__session.remove()
 
     def add_user(self, email: str, hashed_password: str) -> User:
         """ Adds user to database
         Return: User Object
+        Raises ValueError (after a rollback) if the email is taken, e.g.
+        by a concurrent registration
         """
         user = User(email=email, hashed_password=hashed_password)
         self._session.add(user)
-        self._session.commit()
+        try:
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            raise ValueError(f'User {email} already exists')
 
         return user
 
@@ -71,3 +152,13 @@ class DB:
             setattr(user, key, value)
 
         self._session.commit()
+
+
+def _sqlite_pragmas(dbapi_connection, busy_timeout: int) -> None:
+    """ WAL journal (readers don't block the writer) and busy timeout
+    for every new SQLite connection
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout={:d}".format(busy_timeout))
+    cursor.close()
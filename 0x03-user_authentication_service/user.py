@@ -10,7 +10,7 @@ class User(Base):
     """Representation of a user """
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True)
-    email = Column(String(250), nullable=False)
+    email = Column(String(250), nullable=False, unique=True, index=True)
     hashed_password = Column(String(250), nullable=False)
-    session_id = Column(String(250))
-    reset_token = Column(String(250))
+    session_id = Column(String(250), unique=True, index=True)
+    reset_token = Column(String(250), unique=True, index=True)